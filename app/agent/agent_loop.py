@@ -5,28 +5,59 @@ Orchestrates:
 - Planning
 - Clarification
 - Retrieval
+- Evidence compression
 - Reasoning
 - Critique
-- Judge evaluation
+- Judge evaluation (two calls, or one combined call)
 - Judge-based auto-retry
+- Conversation sessions (follow-up questions reuse prior evidence)
+- LLM scheduler metrics (queue depth, admission waits) in the trace
 """
 
+import time
 from typing import Tuple, Dict, Any
-from app.agent.planner import create_plan
+from app.agent.planner import create_plan, fallback_plan
 from app.agent.reasoner import reason
 from app.agent.critic import critique_answer
 from app.agent.judge import judge_answer
-from app.tools.evidence import retrieve_and_build_evidence
+from app.agent.evaluator import evaluate_answer
+from app.agent.llm_calls import STAGE_DEADLINES, MalformedResponse
+from app.agent.session import Session
+from app.tools.compression import compress_evidence
+from app.tools.evidence import (
+    build_evidence,
+    retrieve_documents,
+    summarize_retrieval,
+)
+from app.config import EVALUATION_MODE
 from app.utils import load_prompt
-from app.llms import llm_fast
+from app.llms import DeadlineExceeded, Priority, llm_fast, llm_priority, scheduler_metrics
 
+# Bounded planner / critic / judge calls that gave up; the request
+# still gets an answer
+BOUNDED_CALL_ERRORS = (DeadlineExceeded, MalformedResponse)
 
-def run_agent(question: str):
+
+def _error(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
+
+
+def _judge(question: str, answer: str, evidence: str) -> dict:
+    """Judge an answer with the configured evaluation mode."""
+    if EVALUATION_MODE == "combined":
+        return evaluate_answer(question, answer, evidence).judge()
+    return judge_answer(question=question, answer=answer, evidence=evidence)
+
+
+def run_agent(question: str, session: Session | None = None):
     """
     Run the full agent loop.
 
     Args:
         question (str): User question
+        session (Session | None): Conversation state; when given, the
+            planner sees previous turns and retrieval only fetches
+            evidence not already in the session pool
 
     Returns:
         Tuple[str, Dict]: Final answer and agent trace
@@ -42,7 +73,13 @@ def run_agent(question: str):
     # =========================
     # Planning
     # =========================
-    plan = create_plan(question)
+    context = session.context() if session is not None else "None"
+    plan_error = None
+    try:
+        plan = create_plan(question, context=context)
+    except BOUNDED_CALL_ERRORS as e:
+        plan_error = _error(e)
+        plan = fallback_plan()
 
     trace["plan"] = {
         "intent": plan.intent,
@@ -51,6 +88,8 @@ def run_agent(question: str):
         "need_clarification": plan.need_clarification,
         "clarification_question": plan.clarification_question,
     }
+    if plan_error is not None:
+        trace["plan"]["error"] = plan_error
 
     print(trace["plan"])
 
@@ -59,15 +98,41 @@ def run_agent(question: str):
     # =========================
     if plan.need_clarification:
         trace["final_state"] = "clarification"
+        trace["scheduler"] = scheduler_metrics()
         return plan.clarification_question, trace
 
     # =========================
     # Retrieval
     # =========================
-    evidence = retrieve_and_build_evidence(
-        tools=plan.tools,
-        query=question
-    )
+    tools = plan.tools
+    if session is not None:
+        # Self-contained subquestions make follow-ups searchable; a
+        # first turn searches the question alone, like stateless requests
+        queries = [question]
+        if session.turn_count:
+            queries = list(dict.fromkeys([question, *plan.subquestions]))
+        tools = session.tools(plan)
+        docs, hits, retrieval_stats = session.retrieve(tools, queries)
+        evidence = build_evidence(docs)
+
+        trace["session"] = {
+            "turn": session.turn_count + 1,
+            **retrieval_stats,
+        }
+        if tools != plan.tools:
+            trace["session"]["tools_from_previous_turn"] = tools
+
+        # Pooled chunks from earlier turns are not this turn's hits
+        trace["retrieval"] = summarize_retrieval(retrieval_stats["tools_run"], hits)
+    else:
+        docs = retrieve_documents(tools=plan.tools, query=question)
+        evidence = build_evidence(docs)
+
+        trace["retrieval"] = summarize_retrieval(plan.tools, docs)
+
+    # Keep only the sentences relevant to the question; the reasoner,
+    # critic and judge prompts all carry this block
+    evidence, trace["compression"] = compress_evidence(evidence, question)
 
     trace["evidence_size"] = len(evidence)
 
@@ -79,11 +144,29 @@ def run_agent(question: str):
     # =========================
     # Critic (logical sanity check)
     # =========================
-    critic_feedback = critique_answer(
-        question=question,
-        answer=answer,
-        evidence=evidence
-    )
+    trace["evaluation_mode"] = EVALUATION_MODE
+
+    evaluation = None
+    evaluation_error = None
+    try:
+        if EVALUATION_MODE == "combined":
+            # One call returns both the critique and the judge verdict
+            evaluation = evaluate_answer(question, answer, evidence)
+            critic_feedback = evaluation.critic()
+        else:
+            critic_feedback = critique_answer(
+                question=question,
+                answer=answer,
+                evidence=evidence
+            )
+    except BOUNDED_CALL_ERRORS as e:
+        # A failed check does not fail a request that has an answer
+        evaluation_error = _error(e)
+        critic_feedback = {
+            "needs_revision": False,
+            "rationale": None,
+            "error": evaluation_error,
+        }
 
     trace["critic"] = critic_feedback
 
@@ -96,22 +179,34 @@ def run_agent(question: str):
             evidence,
             critique=critic_feedback.get("rationale")
         )
+        # The combined verdict scored the answer before revision
+        evaluation = None
 
     # =========================
     # Judge (quality evaluator)
     # =========================
-    judge = judge_answer(
-        question=question,
-        answer=answer,
-        evidence=evidence
-    )
-
-    trace["judge"] = judge
+    judge = None
+    if evaluation is not None:
+        judge = evaluation.judge()
+    elif EVALUATION_MODE == "combined" and evaluation_error is not None:
+        # The failed combined call was the judge call as well
+        judge_error = evaluation_error
+    else:
+        try:
+            judge = _judge(question, answer, evidence)
+        except BOUNDED_CALL_ERRORS as e:
+            judge_error = _error(e)
+
+    if judge is None:
+        # Unscored answers are returned as they are, without a retry
+        trace["judge"] = {"verdict": "unavailable", "error": judge_error}
+    else:
+        trace["judge"] = judge
 
     # =========================
     # Judge-based auto-retry (ONE TIME)
     # =========================
-    if judge["verdict"] == "needs_review":
+    if judge is not None and judge["verdict"] == "needs_review":
         trace["auto_retry"] = True
 
         retry_prompt = load_prompt("reasoner_retry.txt").format(
@@ -121,25 +216,35 @@ def run_agent(question: str):
             evidence=evidence
         )
 
-        revised_answer = llm_fast.invoke(retry_prompt).content.strip()
-
-        retry_judge = judge_answer(
-            question=question,
-            answer=revised_answer,
-            evidence=evidence
-        )
-
-        trace["retry"] = {
-            "judge": retry_judge
-        }
-
-        # Accept retry only if it improves quality
-        if retry_judge["score"] >= judge["score"]:
-            answer = revised_answer
-            trace["judge"] = retry_judge
+        # Retries yield to first-attempt traffic under load; the
+        # deadline keeps sustained load from starving them forever
+        retry_judge = None
+        with llm_priority(Priority.RETRY):
+            try:
+                deadline = time.monotonic() + STAGE_DEADLINES["retry"]
+                revised_answer = llm_fast.invoke(retry_prompt, deadline=deadline).content.strip()
+                retry_judge = _judge(question, revised_answer, evidence)
+            except BOUNDED_CALL_ERRORS as e:
+                trace["retry"] = {"error": _error(e)}
+
+        # Accept retry only if it improves quality; an unscored retry
+        # is discarded
+        if retry_judge is not None:
+            trace["retry"] = {
+                "judge": retry_judge
+            }
+
+            if retry_judge["score"] >= judge["score"]:
+                answer = revised_answer
+                trace["judge"] = retry_judge
 
     # =========================
     # Finalize
     # =========================
+    if session is not None:
+        session.record_turn(question, plan, tools)
+
     trace["final_state"] = "answered"
+    # Queue depth and admission waits per model, as of this request
+    trace["scheduler"] = scheduler_metrics()
     return answer, trace
@@ -5,8 +5,7 @@ Performs a lightweight logical consistency check on the agent's answer
 before final evaluation by the judge.
 """
 
-import json
-from app.llms import llm_fast
+from app.agent.llm_calls import invoke_json
 from app.utils import load_prompt
 
 
@@ -33,8 +32,12 @@ def critique_answer(question: str, answer: str, evidence: str) -> dict:
         evidence=evidence
     )
 
-    # Invoke LLM
-    response = llm_fast.invoke(prompt).content.strip()
+    # Invoke LLM and parse strict JSON (hedged, deadline-bound)
+    return invoke_json(prompt, stage="critic", validate=_validate)
 
-    # Parse strict JSON
-    return json.loads(response)
+
+def _validate(data: dict) -> dict:
+    """Reject replies missing the fields the agent loop relies on."""
+    if not isinstance(data, dict) or "needs_revision" not in data:
+        raise ValueError("critic reply missing 'needs_revision'")
+    return data
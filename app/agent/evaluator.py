@@ -0,0 +1,62 @@
+"""
+Combined critic + judge evaluator.
+
+Responsibilities:
+- Run the critic's logical check and the judge's scoring in one call
+- Validate the reply against a structured schema
+- Expose critic- and judge-shaped results for the agent loop
+
+Used when `EVALUATION_MODE` is "combined", so the question, answer and
+evidence are sent (and billed) once per evaluation instead of twice.
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.agent.llm_calls import invoke_json
+from app.utils import load_prompt
+
+
+class Evaluation(BaseModel):
+    needs_revision: bool
+    critic_rationale: str
+    score: float = Field(ge=0, le=1)
+    grounded: bool
+    relevant: bool
+    well_cited: bool
+    confidence: Literal["high", "medium", "low"]
+    verdict: Literal["approve", "needs_review"]
+    rationale: str
+
+    def critic(self) -> dict:
+        """Critic feedback in the shape `critique_answer` returns."""
+        return {
+            "needs_revision": self.needs_revision,
+            "rationale": self.critic_rationale,
+        }
+
+    def judge(self) -> dict:
+        """Judge verdict in the shape `judge_answer` returns."""
+        return self.model_dump(exclude={"needs_revision", "critic_rationale"})
+
+
+def evaluate_answer(question: str, answer: str, evidence: str) -> Evaluation:
+    """
+    Critique and judge an answer with a single LLM call.
+
+    Args:
+        question (str): Original user question
+        answer (str): Agent-generated answer
+        evidence (str): Evidence used for reasoning
+
+    Returns:
+        Evaluation: Critic and judge results
+    """
+    prompt = load_prompt("evaluate.txt").format(
+        question=question,
+        answer=answer,
+        evidence=evidence
+    )
+
+    return invoke_json(prompt, stage="evaluator", validate=lambda data: Evaluation(**data))
@@ -5,8 +5,7 @@ Evaluates the quality of the agent's final answer
 based on grounding, relevance, and citation quality.
 """
 
-import json
-from app.llms import llm_fast
+from app.agent.llm_calls import invoke_json
 from app.utils import load_prompt
 
 
@@ -28,5 +27,11 @@ def judge_answer(question: str, answer: str, evidence: str) -> dict:
         evidence=evidence
     )
 
-    response = llm_fast.invoke(prompt).content.strip()
-    return json.loads(response)
+    return invoke_json(prompt, stage="judge", validate=_validate)
+
+
+def _validate(data: dict) -> dict:
+    """Reject replies missing the fields the agent loop relies on."""
+    if not isinstance(data, dict) or not {"verdict", "score"} <= data.keys():
+        raise ValueError("judge reply missing 'verdict' or 'score'")
+    return data
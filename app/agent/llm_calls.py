@@ -0,0 +1,250 @@
+"""
+Deadline-aware, hedged JSON calls to the LLM.
+
+Responsibilities:
+- Enforce a per-stage deadline on short JSON-producing calls
+- Send one hedged duplicate when the first attempt is slower than the
+  stage's observed p90 latency
+- Accept whichever attempt returns valid JSON first
+- Retry a bounded number of malformed replies
+- Treat a provider error as one failed attempt while others are pending
+- Record hedge rate and latency per stage
+
+Used by the planner, critic, judge and combined evaluator, whose tail
+latency dominates the end-to-end request latency.
+"""
+
+import contextvars
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from app.llms import DeadlineExceeded, llm_fast
+
+# Wall-clock budget per stage, in seconds
+STAGE_DEADLINES: Dict[str, float] = {
+    "planner": 20.0,
+    "critic": 30.0,
+    "judge": 30.0,
+    "evaluator": 30.0,
+    # Judge-driven answer rewrite; queued behind first attempts
+    "retry": 30.0,
+}
+DEFAULT_DEADLINE = 30.0
+
+# Malformed replies retried before giving up
+MAX_MALFORMED_RETRIES = 2
+
+# Latency samples required before hedging is enabled for a stage
+MIN_HEDGE_SAMPLES = 20
+
+_JSON_REMINDER = "\n\nReturn ONLY the JSON object, with no surrounding text."
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-call")
+
+
+class MalformedResponse(ValueError):
+    """Raised when every attempt returned unparseable or invalid JSON."""
+
+
+class StageStats:
+    """
+    Rolling latency window and counters for one stage.
+
+    Args:
+        window (int): Number of latency samples kept
+    """
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=window)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.malformed = 0
+        self.errors = 0
+        self.deadline_exceeded = 0
+
+    def record(self, latency: float):
+        with self._lock:
+            self.latencies.append(latency)
+
+    def incr(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile in seconds, or None without enough samples."""
+        with self._lock:
+            if len(self.latencies) < MIN_HEDGE_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p90 = self.percentile(0.5), self.percentile(0.9)
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "malformed": self.malformed,
+            "errors": self.errors,
+            "deadline_exceeded": self.deadline_exceeded,
+            "latency_ms_p50": round(1000 * p50, 1) if p50 is not None else None,
+            "latency_ms_p90": round(1000 * p90, 1) if p90 is not None else None,
+        }
+
+
+_stats: Dict[str, StageStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _stage_stats(stage: str) -> StageStats:
+    with _stats_lock:
+        return _stats.setdefault(stage, StageStats())
+
+
+def call_stats() -> Dict[str, Dict[str, Any]]:
+    """Hedging and latency counters for every stage seen so far."""
+    with _stats_lock:
+        stages = dict(_stats)
+    return {stage: stats.snapshot() for stage, stats in stages.items()}
+
+
+def reset_call_stats():
+    """Forget all recorded latencies and counters."""
+    with _stats_lock:
+        _stats.clear()
+
+
+def parse_json(text: str) -> Any:
+    """
+    Parse a JSON reply, tolerating a surrounding Markdown code fence.
+
+    Raises:
+        ValueError: If the text is not valid JSON
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1]
+        text = text.rsplit("```", 1)[0]
+    return json.loads(text)
+
+
+def invoke_json(
+    prompt: str,
+    stage: str,
+    llm=llm_fast,
+    validate: Optional[Callable[[Any], Any]] = None,
+    hedge: bool = True
+) -> Any:
+    """
+    Invoke the LLM and return its parsed JSON reply.
+
+    Attempts run on a shared thread pool. If the first attempt is still
+    outstanding after the stage's observed p90 latency, one duplicate is
+    sent and the first valid reply wins. Malformed or invalid replies
+    trigger an immediate retry with a JSON reminder, up to
+    `MAX_MALFORMED_RETRIES` times. A provider error (connection, rate
+    limit) only fails the call once no other attempt is outstanding.
+
+    Args:
+        prompt (str): Fully formatted prompt
+        stage (str): Stage name used for deadlines and statistics
+        llm: Chat model exposing `.invoke(prompt, deadline=...)`
+        validate (Callable | None): Converts / validates the parsed JSON;
+            raising marks the reply as malformed
+        hedge (bool): Allow a hedged duplicate request
+
+    Returns:
+        Any: The parsed (and validated) reply
+
+    Raises:
+        DeadlineExceeded: If no valid reply arrived before the deadline
+        MalformedResponse: If every attempt returned invalid JSON
+        Exception: The provider error of the last attempt, if it failed
+            with one and no other attempt was outstanding
+    """
+    stats = _stage_stats(stage)
+    stats.incr("calls")
+
+    started = time.monotonic()
+    deadline = started + STAGE_DEADLINES.get(stage, DEFAULT_DEADLINE)
+
+    def attempt(text: str):
+        begin = time.monotonic()
+        reply = llm.invoke(text, deadline=deadline).content
+        stats.record(time.monotonic() - begin)
+        data = parse_json(reply)
+        return validate(data) if validate else data
+
+    def submit(text: str):
+        ctx = contextvars.copy_context()
+        return _executor.submit(ctx.run, attempt, text)
+
+    pending = {submit(prompt)}
+    hedged = None
+    hedge_at = None
+    if hedge:
+        p90 = stats.percentile(0.9)
+        if p90 is not None:
+            hedge_at = started + p90
+
+    retries = 0
+    last_error: Optional[BaseException] = None
+
+    while pending:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+
+        wake = deadline if hedge_at is None else min(hedge_at, deadline)
+        done, pending = wait(pending, timeout=wake - now, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            try:
+                result = future.result()
+            except (ValueError, TypeError) as e:
+                # Unparseable JSON or failed schema validation
+                stats.incr("malformed")
+                last_error = e
+                if retries < MAX_MALFORMED_RETRIES:
+                    retries += 1
+                    pending.add(submit(prompt + _JSON_REMINDER))
+                continue
+            except DeadlineExceeded as e:
+                last_error = e
+                continue
+            except Exception as e:
+                # Provider error; a hedged duplicate may still succeed
+                stats.incr("errors")
+                last_error = e
+                continue
+
+            if future is hedged:
+                stats.incr("hedge_wins")
+            for other in pending:
+                other.cancel()
+            return result
+
+        if hedge_at is not None and time.monotonic() >= hedge_at and pending:
+            stats.incr("hedged")
+            hedge_at = None
+            hedged = submit(prompt)
+            pending.add(hedged)
+
+    for other in pending:
+        other.cancel()
+
+    if pending or isinstance(last_error, DeadlineExceeded):
+        stats.incr("deadline_exceeded")
+        raise DeadlineExceeded(f"{stage} did not return valid JSON in time")
+
+    if not isinstance(last_error, (ValueError, TypeError)):
+        raise last_error
+
+    raise MalformedResponse(f"{stage} returned invalid JSON: {last_error}")
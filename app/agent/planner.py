@@ -5,12 +5,12 @@ Responsibilities:
 - Interpret user intent
 - Select which tools to invoke
 - Decide whether clarification is required
+- Provide a search-everything plan when planning fails
 """
 
-import json
 from pydantic import BaseModel
 from typing import List, Optional
-from app.llms import llm_fast
+from app.agent.llm_calls import invoke_json
 from app.tools.registry import TOOL_REGISTRY
 from app.utils import load_prompt
 
@@ -23,11 +23,32 @@ class Plan(BaseModel):
     clarification_question: Optional[str]
 
 
-def create_plan(question: str) -> Plan:
+def fallback_plan() -> Plan:
+    """
+    Plan used when the planner call fails: search every registered tool.
+
+    Answering from all collections is slower than a planned search but
+    better than failing the request.
+    """
+    return Plan(
+        intent="unknown",
+        subquestions=[],
+        tools=list(TOOL_REGISTRY),
+        need_clarification=False,
+        clarification_question=None
+    )
+
+
+def create_plan(question: str, context: str = "None") -> Plan:
     """
     Generate a structured execution plan from the user question.
+
+    Args:
+        question (str): User question
+        context (str): Summary of previous conversation turns, used to
+            resolve follow-up questions
     """
-    
+
     tools_desc = "\n".join(
         f"- {name}: {meta['description']}"
         for name, meta in TOOL_REGISTRY.items()
@@ -35,8 +56,12 @@ def create_plan(question: str) -> Plan:
 
     prompt = load_prompt("planner.txt").format(
         question=question,
+        context=context,
         tools=tools_desc
     )
 
-    response = llm_fast.invoke(prompt).content
-    return Plan(**json.loads(response))
+    return invoke_json(
+        prompt,
+        stage="planner",
+        validate=lambda data: Plan(**data)
+    )
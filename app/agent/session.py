@@ -0,0 +1,304 @@
+"""
+Conversation sessions.
+
+Responsibilities:
+- Remember the previous plan, question history, query vectors and
+  retrieved evidence for a user's conversation
+- Retrieve only incremental evidence for follow-up questions
+- Bound session memory with an LRU policy across users
+
+A follow-up such as "and what about PodSecurity?" is planned with the
+previous turns as context, reuses cached query vectors (embedding a
+turn's new queries in one call), and only runs (tool, query) pairs
+whose chunks are still in the session pool. A
+follow-up planned without tools reuses the previous turn's tools.
+
+Sessions are shared across UI worker threads; each one guards its
+state with its own lock, held only while state is read or updated
+(never across retrieval or LLM calls).
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.tools.evidence import retrieve_documents
+
+# Total approximate bytes held by all sessions before LRU eviction
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(64 * 2**20)))
+
+# Evidence chunks kept per session (oldest dropped first)
+SESSION_MAX_POOL = int(os.getenv("SESSION_MAX_POOL", "60"))
+
+# Cached query vectors per session (least recently used dropped first)
+SESSION_MAX_VECTORS = 32
+
+# (tool, query) pairs remembered per session, oldest forgotten first
+SESSION_MAX_RETRIEVED = 4 * SESSION_MAX_POOL
+
+# Previous turns included in the planner context
+SESSION_CONTEXT_TURNS = 3
+
+
+def _embed_queries(queries: list) -> list:
+    # Imported lazily: the retrieval tools open every vector store
+    from app.tools.retrieval_tools import emb
+    return emb.embed_documents(queries)
+
+
+def _doc_size(doc) -> int:
+    # Chunk-store hits hold a row reference, not a copy of the text
+    text = 0 if hasattr(doc, "snippet") else sys.getsizeof(doc.page_content)
+    return text + 64 * len(doc.metadata)
+
+
+class Session:
+    """
+    State carried between the turns of one conversation.
+
+    Attributes:
+        session_id (str): Owner key (e.g. the UI session hash)
+        turns (list[dict]): Recent questions with their plan intent
+            (the last `SESSION_CONTEXT_TURNS`)
+        turn_count (int): Turns answered so far
+        plan: Plan of the most recent answered turn
+        query_vectors (OrderedDict): Query text -> float32 vector
+        pool (OrderedDict): (url, chunk_id) -> Document, newest last
+        retrieved (OrderedDict): (tool, query) pairs executed whose
+            chunks are all still pooled, oldest first
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.turns: List[Dict] = []
+        self.turn_count = 0
+        self.plan = None
+        self.query_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.pool: "OrderedDict[Tuple[str, int], object]" = OrderedDict()
+        self.retrieved: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self.lock = threading.RLock()
+
+        # Pooled chunk -> (tool, query) pairs that returned it
+        self._sources: Dict[Tuple[str, int], set] = {}
+
+    # =========================
+    # Planning context
+    # =========================
+    def context(self) -> str:
+        """Summarize recent turns for the planner prompt."""
+        with self.lock:
+            if not self.turns:
+                return "None"
+
+            recent = self.turns[-SESSION_CONTEXT_TURNS:]
+            return "\n".join(
+                f"- Q: {turn['question']} (intent: {turn['intent']})"
+                for turn in recent
+            )
+
+    def tools(self, plan) -> list:
+        """
+        Tools to run for a turn.
+
+        A follow-up the planner could not map to any tool (e.g. "and
+        for Deployments?") keeps searching the previous turn's tools.
+        """
+        with self.lock:
+            if plan.tools or self.plan is None:
+                return list(plan.tools)
+            return list(self.plan.tools)
+
+    def record_turn(self, question: str, plan, tools: Optional[list] = None):
+        """
+        Remember an answered turn and its plan.
+
+        Args:
+            question (str): The turn's question
+            plan (Plan): The turn's plan
+            tools (list | None): Tools actually used, when they differ
+                from the plan's (see `tools`)
+        """
+        if tools is not None and tools != plan.tools:
+            plan = plan.model_copy(update={"tools": list(tools)})
+
+        with self.lock:
+            self.turns.append({"question": question, "intent": plan.intent})
+            self.turns = self.turns[-SESSION_CONTEXT_TURNS:]
+            self.turn_count += 1
+            self.plan = plan
+
+    # =========================
+    # Retrieval
+    # =========================
+    def vectors(self, queries: list) -> Dict[str, np.ndarray]:
+        """Return query vectors, embedding all uncached ones in one call."""
+        found = {}
+        with self.lock:
+            for query in queries:
+                vector = self.query_vectors.get(query)
+                if vector is not None:
+                    self.query_vectors.move_to_end(query)
+                    found[query] = vector
+
+        missing = [query for query in dict.fromkeys(queries) if query not in found]
+        if not missing:
+            return found
+
+        embedded = _embed_queries(missing)
+
+        with self.lock:
+            for query, vector in zip(missing, embedded):
+                vector = np.asarray(vector, dtype=np.float32)
+                found[query] = self.query_vectors[query] = vector
+            while len(self.query_vectors) > SESSION_MAX_VECTORS:
+                self.query_vectors.popitem(last=False)
+        return found
+
+    def vector(self, query: str):
+        """Return the cached query vector, embedding it on first use."""
+        return self.vectors([query])[query]
+
+    def _evict(self, key: Tuple[str, int]):
+        """Drop a pooled chunk; the pairs that returned it run again."""
+        self.pool.pop(key, None)
+        for pair in self._sources.pop(key, ()):
+            self.retrieved.pop(pair, None)
+
+    def retrieve(self, tools: list, queries: list) -> Tuple[list, list, dict]:
+        """
+        Retrieve new evidence and merge it into the pool.
+
+        Args:
+            tools (list): Tool names selected for this turn
+            queries (list): Retrieval queries for this turn
+
+        Returns:
+            Tuple[list, list, dict]: Documents for this turn's evidence
+            (new chunks first, then pooled ones), the documents the
+            tools returned this turn, and retrieval statistics
+            (`tools_run` lists the tools that actually ran)
+        """
+        stats = {"queries": len(queries), "skipped": 0, "new_chunks": 0}
+        fresh, fresh_keys, hits, ran = [], set(), [], set()
+
+        with self.lock:
+            todo = {
+                query: [t for t in tools if (t, query) not in self.retrieved]
+                for query in queries
+            }
+        stats["skipped"] = sum(len(tools) - len(pending) for pending in todo.values())
+        todo = {query: pending for query, pending in todo.items() if pending}
+        vectors = self.vectors(list(todo))
+
+        for query, pending in todo.items():
+            # Tools run without the lock; only the merge below holds it
+            embedding = vectors[query].tolist()
+            docs = retrieve_documents(pending, query, embedding=embedding)
+            hits.extend(docs)
+            ran.update(pending)
+
+            with self.lock:
+                for doc in docs:
+                    key = (doc.metadata["url"], doc.metadata["chunk_id"])
+                    if key not in self.pool and key not in fresh_keys:
+                        fresh.append(doc)
+                        fresh_keys.add(key)
+                    self.pool[key] = doc
+                    self.pool.move_to_end(key)
+                    self._sources.setdefault(key, set()).add((doc.metadata["tool"], query))
+
+                for tool in pending:
+                    self.retrieved[(tool, query)] = None
+
+        with self.lock:
+            while len(self.pool) > SESSION_MAX_POOL:
+                self._evict(next(iter(self.pool)))
+            while len(self.retrieved) > SESSION_MAX_RETRIEVED:
+                self.retrieved.popitem(last=False)
+
+            stats["new_chunks"] = len(fresh)
+            stats["pool_size"] = len(self.pool)
+            stats["tools_run"] = [t for t in tools if t in ran]
+
+            pooled = [
+                doc for key, doc in reversed(self.pool.items())
+                if key not in fresh_keys
+            ]
+        return fresh + pooled, hits, stats
+
+    # =========================
+    # Accounting
+    # =========================
+    def size_bytes(self) -> int:
+        """Approximate memory held by this session."""
+        with self.lock:
+            size = sum(v.nbytes + sys.getsizeof(q) for q, v in self.query_vectors.items())
+            size += sum(_doc_size(doc) for doc in self.pool.values())
+            size += sum(sys.getsizeof(t["question"]) for t in self.turns)
+            size += sum(sys.getsizeof(query) for _, query in self.retrieved)
+        return size
+
+
+class SessionStore:
+    """
+    LRU store of sessions bounded by total approximate memory.
+
+    Args:
+        max_bytes (int): Memory budget across all sessions
+    """
+
+    def __init__(self, max_bytes: int = SESSION_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, session_id: str) -> Session:
+        """Return (creating if needed) a session and mark it recently used."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(session_id)
+                self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def reset(self, session_id: str):
+        """Forget a session."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def enforce_limit(self, keep: Optional[str] = None) -> int:
+        """
+        Evict least recently used sessions until within budget.
+
+        Args:
+            keep (str | None): Session that must survive (the caller's)
+
+        Returns:
+            int: Total approximate bytes after eviction
+        """
+        with self._lock:
+            sizes = {sid: s.size_bytes() for sid, s in self._sessions.items()}
+            total = sum(sizes.values())
+
+            for sid in list(self._sessions):
+                if total <= self.max_bytes:
+                    break
+                if sid == keep:
+                    continue
+                self._sessions.pop(sid)
+                total -= sizes[sid]
+                self.evictions += 1
+
+            return total
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+SESSIONS = SessionStore()
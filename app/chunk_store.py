@@ -0,0 +1,244 @@
+"""
+Memory-mapped chunk text store.
+
+Responsibilities:
+- Write chunk text and metadata next to a vector store at ingestion
+- Serve chunk text by slicing one memory-mapped UTF-8 blob
+- Serve metadata from interned, array-backed columns indexed by row
+
+Layout (inside a store version directory):
+    chunks/text.bin      -> all chunk texts, UTF-8, concatenated
+    chunks/offsets.npy   -> uint64 byte offset of each chunk
+    chunks/lengths.npy   -> uint32 byte length of each chunk
+    chunks/chunk_id.npy  -> int32 chunk index within its document
+    chunks/url.npy, chunks/source_name.npy, chunks/source_type.npy,
+    chunks/duplicate_sources.npy
+                         -> uint32 indices into strings.json
+    chunks/duplicate_count.npy
+                         -> uint32 near-duplicates dropped at ingestion
+    chunks/strings.json  -> interned string table
+
+`duplicate_count` / `duplicate_sources` appear in a chunk's metadata
+only when ingestion recorded duplicates for it, as on the Document.
+
+Row numbers double as the Chroma ids, so a vector search only needs to
+return ids and scores. Files are opened read-only with mmap, so worker
+processes share the same page-cache pages. The mapping is closed by
+`close()`, or once the store and every ChunkRef into it are gone.
+"""
+
+import json
+import mmap
+import sys
+import weakref
+from pathlib import Path
+
+import numpy as np
+
+CHUNKS_DIR = "chunks"
+
+_COLUMNS = ("url", "source_name", "source_type", "duplicate_sources")
+
+# Columns added after the first layout; older stores load without them
+_OPTIONAL_COLUMNS = ("duplicate_sources",)
+
+# Worst-case UTF-8 bytes per character, used to bound snippet slices
+_MAX_UTF8_BYTES = 4
+
+
+class ChunkRef:
+    """
+    Lightweight retrieval hit backed by a `ChunkStore` row.
+
+    Quacks like a LangChain `Document` (`page_content`, `metadata`, `id`)
+    but decodes text only when asked, and `snippet` decodes just the
+    bytes needed for a truncated view.
+    """
+
+    __slots__ = ("_store", "row", "metadata")
+
+    def __init__(self, store: "ChunkStore", row: int):
+        self._store = store
+        self.row = row
+        self.metadata = store.metadata(row)
+
+    @property
+    def id(self) -> str:
+        return str(self.row)
+
+    @property
+    def page_content(self) -> str:
+        return self._store.text(self.row)
+
+    def snippet(self, chars: int) -> str:
+        """Return the first `chars` characters of the chunk."""
+        return self._store.snippet(self.row, chars)
+
+    def __repr__(self):
+        return f"ChunkRef(row={self.row}, metadata={self.metadata})"
+
+
+class ChunkStore:
+    """
+    Read-only view over a chunk store directory.
+
+    Args:
+        directory (Path): The `chunks/` directory of a store version
+    """
+
+    def __init__(self, directory: Path):
+        directory = Path(directory)
+
+        self._file = open(directory / "text.bin", "rb")
+        size = directory.joinpath("text.bin").stat().st_size
+        if size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buffer = memoryview(self._mmap)
+        else:
+            self._mmap = None
+            self._buffer = memoryview(b"")
+        # Hits keep their store alive, so a replaced version is released
+        # only after the last request holding its hits is done
+        self._finalizer = weakref.finalize(
+            self, _release, self._buffer, self._mmap, self._file
+        )
+
+        self.offsets = np.load(directory / "offsets.npy", mmap_mode="r")
+        self.lengths = np.load(directory / "lengths.npy", mmap_mode="r")
+        self.chunk_ids = np.load(directory / "chunk_id.npy", mmap_mode="r")
+        self.columns = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in _COLUMNS
+            if name not in _OPTIONAL_COLUMNS or (directory / f"{name}.npy").exists()
+        }
+
+        counts = directory / "duplicate_count.npy"
+        self.duplicate_counts = np.load(counts, mmap_mode="r") if counts.exists() else None
+
+        strings = json.loads((directory / "strings.json").read_text(encoding="utf-8"))
+        self.strings = [sys.intern(s) for s in strings]
+
+    # =========================
+    # Writing
+    # =========================
+    @staticmethod
+    def write(directory, documents) -> Path:
+        """
+        Write documents as a chunk store; row i is documents[i].
+
+        Args:
+            directory: Store version directory
+            documents (list[Document]): Chunks in Chroma id order
+
+        Returns:
+            Path: The written `chunks/` directory
+        """
+        target = Path(directory) / CHUNKS_DIR
+        target.mkdir(parents=True, exist_ok=True)
+
+        table: dict[str, int] = {}
+        columns = {name: np.empty(len(documents), dtype=np.uint32) for name in _COLUMNS}
+        offsets = np.empty(len(documents), dtype=np.uint64)
+        lengths = np.empty(len(documents), dtype=np.uint32)
+        chunk_ids = np.empty(len(documents), dtype=np.int32)
+        duplicate_counts = np.zeros(len(documents), dtype=np.uint32)
+
+        position = 0
+        with open(target / "text.bin", "wb") as f:
+            for row, doc in enumerate(documents):
+                data = doc.page_content.encode("utf-8")
+                f.write(data)
+                offsets[row] = position
+                lengths[row] = len(data)
+                position += len(data)
+
+                chunk_ids[row] = doc.metadata["chunk_id"]
+                duplicate_counts[row] = doc.metadata.get("duplicate_count", 0)
+                for name in _COLUMNS:
+                    value = str(doc.metadata.get(name, ""))
+                    columns[name][row] = table.setdefault(value, len(table))
+
+        np.save(target / "offsets.npy", offsets)
+        np.save(target / "lengths.npy", lengths)
+        np.save(target / "chunk_id.npy", chunk_ids)
+        np.save(target / "duplicate_count.npy", duplicate_counts)
+        for name, values in columns.items():
+            np.save(target / f"{name}.npy", values)
+
+        (target / "strings.json").write_text(json.dumps(list(table)), encoding="utf-8")
+        return target
+
+    @classmethod
+    def open(cls, directory) -> "ChunkStore | None":
+        """Open the chunk store of a version directory, if it has one."""
+        target = Path(directory) / CHUNKS_DIR
+        if not (target / "strings.json").exists():
+            return None
+        return cls(target)
+
+    # =========================
+    # Reading
+    # =========================
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _bytes(self, row: int, limit: int | None = None) -> memoryview:
+        start = int(self.offsets[row])
+        length = int(self.lengths[row])
+        if limit is not None:
+            length = min(length, limit)
+        return self._buffer[start:start + length]
+
+    def text(self, row: int) -> str:
+        """Full text of a chunk."""
+        return str(self._bytes(row), "utf-8")
+
+    def snippet(self, row: int, chars: int) -> str:
+        """
+        First `chars` characters of a chunk.
+
+        Only up to `chars * 4` bytes are decoded; a multi-byte character
+        cut at the slice boundary is dropped.
+        """
+        view = self._bytes(row, chars * _MAX_UTF8_BYTES)
+        return str(view, "utf-8", "ignore")[:chars]
+
+    def metadata(self, row: int) -> dict:
+        """Metadata of a chunk, built from interned column values."""
+        meta = {
+            name: self.strings[int(column[row])]
+            for name, column in self.columns.items()
+        }
+        meta["chunk_id"] = int(self.chunk_ids[row])
+
+        count = int(self.duplicate_counts[row]) if self.duplicate_counts is not None else 0
+        if count:
+            meta["duplicate_count"] = count
+        else:
+            meta.pop("duplicate_sources", None)
+        return meta
+
+    def prefetch(self):
+        """Ask the OS to read the mapped text into the page cache."""
+        if self._mmap is not None and hasattr(self._mmap, "madvise"):
+            self._mmap.madvise(mmap.MADV_WILLNEED)
+
+    def ref(self, row: int) -> ChunkRef:
+        """Retrieval hit for a row."""
+        return ChunkRef(self, row)
+
+    @property
+    def closed(self) -> bool:
+        """True once the mapping and file have been released."""
+        return not self._finalizer.alive
+
+    def close(self):
+        """Release the mapping (views handed out become invalid)."""
+        self._finalizer()
+
+
+def _release(buffer: memoryview, mapping, file):
+    buffer.release()
+    if mapping is not None:
+        mapping.close()
+    file.close()
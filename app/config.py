@@ -16,3 +16,66 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 if not OPENAI_API_KEY:
     raise RuntimeError("OPENAI_API_KEY is required")
+
+# =========================
+# Embedding storage
+# =========================
+# Must be identical at ingestion and query time.
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Shortened embedding size (text-embedding-3 supports 256..1536).
+# Unset keeps the model's native 1536 dimensions.
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None
+
+# Precision of the in-memory search index: float32 (Chroma HNSW),
+# float16 or int8 (quantized index, no Chroma collection is built).
+EMBEDDING_PRECISION = os.getenv("EMBEDDING_PRECISION", "float32")
+
+# Candidates per requested result re-scored against the memory-mapped
+# float32 vectors when searching a quantized index. 0 disables re-scoring.
+EMBEDDING_RESCORE_FACTOR = int(os.getenv("EMBEDDING_RESCORE_FACTOR", "4"))
+
+# =========================
+# Adaptive-k retrieval
+# =========================
+# Scores are cosine similarities between the query and chunk vectors.
+RETRIEVAL_BASE_K = int(os.getenv("RETRIEVAL_BASE_K", "6"))
+RETRIEVAL_MAX_K = int(os.getenv("RETRIEVAL_MAX_K", "12"))
+
+# A tool whose best hit scores below this contributes nothing.
+RETRIEVAL_SCORE_FLOOR = float(os.getenv("RETRIEVAL_SCORE_FLOOR", "0.25"))
+
+# Stop once a hit falls this far below the best hit...
+RETRIEVAL_RELATIVE_CUTOFF = float(os.getenv("RETRIEVAL_RELATIVE_CUTOFF", "0.15"))
+
+# ...or drops this much below its predecessor.
+RETRIEVAL_SCORE_GAP = float(os.getenv("RETRIEVAL_SCORE_GAP", "0.08"))
+
+# When the first BASE_K scores lie within this spread, fetch up to MAX_K.
+RETRIEVAL_CLUSTER_SPREAD = float(os.getenv("RETRIEVAL_CLUSTER_SPREAD", "0.03"))
+
+# =========================
+# Evidence compression
+# =========================
+# Share of each chunk's snippet kept after query-focused sentence
+# selection before evidence reaches the reasoner, critic and judge.
+# 1 disables compression. Off by default: compression is lossy, so set
+# e.g. 0.5 only after `python -m benchmarks.evidence_compression --live`
+# shows no judge regression for your corpus.
+EVIDENCE_COMPRESSION_RATIO = float(os.getenv("EVIDENCE_COMPRESSION_RATIO", "1"))
+
+# =========================
+# Answer evaluation
+# =========================
+# "combined" critiques and judges an answer in one structured call;
+# "separate" uses the critic and judge prompts as two calls.
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "combined")
+
+# =========================
+# Startup warm-up
+# =========================
+# Load collections, tokenizers, prompts and LLM connections before the
+# UI starts serving, so the first request is not a cold one.
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+# Longest a request waits for warm-up before being served cold (seconds)
+WARMUP_READY_TIMEOUT = float(os.getenv("WARMUP_READY_TIMEOUT", "30"))
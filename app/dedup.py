@@ -0,0 +1,282 @@
+"""
+Near-duplicate chunk elimination.
+
+Responsibilities:
+- Build MinHash signatures over word shingles of each chunk
+- Find near-duplicate candidates with banded locality-sensitive hashing
+- Keep one canonical chunk and record alternate sources in its metadata
+- Drop cross-collection matches only for boilerplate, so every
+  collection keeps the evidence its own search tool must return
+- Report how much of the corpus was removed as duplicate
+
+Scraped pages repeat a lot of boilerplate (sidebars, license footers,
+copied code snippets). Dropping those chunks before embedding shrinks
+the index, the embedding spend, and redundant evidence at query time.
+
+This module is used during ingestion only.
+"""
+
+import hashlib
+import random
+import re
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# Mersenne prime used for the universal hash family h(x) = (a*x + b) mod p
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Upper bound on alternates kept in metadata; the count stays exact
+MAX_RECORDED_SOURCES = 20
+
+# Occurrences (across all collections) from which a text counts as
+# boilerplate and is also dropped from collections other than its first
+BOILERPLATE_MIN_REPEATS = 3
+
+
+def _citation(doc: Document) -> str:
+    """Format a chunk reference the same way evidence headers do."""
+    meta = doc.metadata
+    return f"[{meta['source_name']}|{meta['chunk_id']}]({meta['url']})"
+
+
+class MinHashDeduplicator:
+    """
+    Incremental MinHash/LSH index over chunk text.
+
+    A single instance can be shared across several collections so that
+    boilerplate repeated between sources is also detected. Within a
+    collection every near-duplicate is dropped. A chunk matching one of
+    another collection is dropped only once its text has occurred
+    `boilerplate_repeats` times; otherwise it stays canonical in its own
+    collection, since each collection is searched by a separate tool.
+    Canonical chunks are mutated in place, so persist documents only
+    after every collection has been passed through the same instance.
+
+    Args:
+        threshold (float): Minimum estimated Jaccard similarity to treat
+            two chunks as duplicates
+        num_perm (int): Number of MinHash permutations
+        bands (int): Number of LSH bands (must divide `num_perm`)
+        shingle_size (int): Words per shingle
+        seed (int): Seed for the permutation coefficients
+        boilerplate_repeats (int): Occurrences from which a
+            cross-collection match is dropped
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 5,
+        seed: int = 1,
+        boilerplate_repeats: int = BOILERPLATE_MIN_REPEATS
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.boilerplate_repeats = boilerplate_repeats
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self._exact: Dict[str, List[int]] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [
+            {} for _ in range(bands)
+        ]
+        self._signatures: List[Tuple[int, ...]] = []
+        self._canonical: List[Document] = []
+        self._groups: List[Optional[str]] = []
+
+        # Canonical chunk -> cluster; cluster -> occurrences seen
+        self._clusters: List[int] = []
+        self._occurrences: List[int] = []
+
+        self.total = 0
+        self.duplicates = 0
+
+    # =========================
+    # Signatures
+    # =========================
+    def shingles(self, text: str) -> set:
+        """
+        Split text into hashed word shingles.
+
+        Texts shorter than one shingle produce a single shingle so they
+        can still be compared.
+        """
+        tokens = _TOKEN_RE.findall(text.lower())
+        size = self.shingle_size
+
+        if len(tokens) <= size:
+            grams = [" ".join(tokens)]
+        else:
+            grams = (
+                " ".join(tokens[i:i + size])
+                for i in range(len(tokens) - size + 1)
+            )
+
+        return {
+            int.from_bytes(
+                hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(),
+                "big"
+            )
+            for g in grams
+        }
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a text."""
+        shingles = self.shingles(text)
+        return tuple(
+            min(((a * s + b) % _PRIME) & _MAX_HASH for s in shingles)
+            for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimate Jaccard similarity from two signatures."""
+        same = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+        return same / len(sig_a)
+
+    # =========================
+    # Index
+    # =========================
+    def _band_keys(self, sig: Tuple[int, ...]):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, sig[start:start + self.rows]
+
+    def _record(self, canonical: Document, duplicate: Document):
+        meta = canonical.metadata
+        count = meta.get("duplicate_count", 0)
+
+        if count < MAX_RECORDED_SOURCES:
+            sources = meta.get("duplicate_sources")
+            ref = _citation(duplicate)
+            meta["duplicate_sources"] = f"{sources}\n{ref}" if sources else ref
+
+        meta["duplicate_count"] = count + 1
+        self.duplicates += 1
+
+    def _match(self, normalized: str, sig, group: Optional[str]) -> Optional[int]:
+        """Best matching canonical chunk, preferring the same group."""
+        exact = self._exact.get(normalized)
+        if exact:
+            matches = [(1.0, idx) for idx in exact]
+        else:
+            candidates = set()
+            for band, key in self._band_keys(sig):
+                candidates.update(self._buckets[band].get(key, ()))
+            matches = [
+                (score, idx)
+                for idx in candidates
+                if (score := self.similarity(sig, self._signatures[idx])) >= self.threshold
+            ]
+
+        if not matches:
+            return None
+
+        same = [m for m in matches if self._groups[m[1]] == group]
+        # Highest score wins; the earliest canonical chunk breaks ties
+        return max(same or matches, key=lambda m: (m[0], -m[1]))[1]
+
+    def add(self, doc: Document, group: Optional[str] = None) -> Optional[Document]:
+        """
+        Index a chunk unless it duplicates one already seen.
+
+        Args:
+            doc (Document): Chunk to check
+            group (str | None): Collection the chunk belongs to
+
+        Returns:
+            Document | None: The canonical chunk if `doc` is a duplicate,
+            otherwise None (and `doc` becomes canonical)
+        """
+        self.total += 1
+
+        normalized = " ".join(_TOKEN_RE.findall(doc.page_content.lower()))
+        sig = None if normalized in self._exact else self.signature(doc.page_content)
+
+        best = self._match(normalized, sig, group)
+        if best is not None:
+            cluster = self._clusters[best]
+            self._occurrences[cluster] += 1
+
+            if (
+                self._groups[best] == group
+                or self._occurrences[cluster] >= self.boilerplate_repeats
+            ):
+                canonical = self._canonical[best]
+                self._record(canonical, doc)
+                return canonical
+        else:
+            cluster = len(self._occurrences)
+            self._occurrences.append(1)
+
+        if sig is None:
+            sig = self.signature(doc.page_content)
+
+        idx = len(self._canonical)
+        self._signatures.append(sig)
+        self._canonical.append(doc)
+        self._groups.append(group)
+        self._clusters.append(cluster)
+        self._exact.setdefault(normalized, []).append(idx)
+
+        for band, key in self._band_keys(sig):
+            self._buckets[band].setdefault(key, []).append(idx)
+
+        return None
+
+    def deduplicate(
+        self,
+        documents: List[Document],
+        group: Optional[str] = None
+    ) -> List[Document]:
+        """
+        Filter a list of chunks down to canonical ones.
+
+        Args:
+            documents (list[Document]): Chunks in ingestion order
+            group (str | None): Collection the chunks belong to
+
+        Returns:
+            list[Document]: Chunks that were not duplicates
+        """
+        return [doc for doc in documents if self.add(doc, group) is None]
+
+    # =========================
+    # Reporting
+    # =========================
+    @property
+    def ratio(self) -> float:
+        """Fraction of chunks removed as duplicates."""
+        return self.duplicates / self.total if self.total else 0.0
+
+    def stats(self) -> dict:
+        """Return dedup counters suitable for logging."""
+        return {
+            "total": self.total,
+            "kept": self.total - self.duplicates,
+            "duplicates": self.duplicates,
+            "ratio": round(self.ratio, 4),
+        }
+
+    def report(self) -> str:
+        """Human-readable summary of the dedup pass."""
+        return (
+            f"Dedup: {self.total} -> {self.total - self.duplicates} chunks "
+            f"({self.ratio:.1%} near-duplicates removed)"
+        )
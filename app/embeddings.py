@@ -0,0 +1,297 @@
+"""
+Embedding client and compact vector storage.
+
+Responsibilities:
+- Create the embedding client shared by ingestion and retrieval
+- Shorten embeddings to the configured dimension count
+- Quantize stored vectors to float16 / int8
+- Search a quantized index with optional full-precision re-scoring
+  against memory-mapped float32 vectors
+
+`text-embedding-3-*` models return Matryoshka-style vectors: keeping
+the first `d` components and re-normalizing is equivalent to requesting
+`dimensions=d` from the API. Queries and documents therefore only need
+to share the same `EMBEDDING_DIMENSIONS` setting to stay comparable.
+
+With float16 / int8 precision a collection is served without Chroma:
+only the quantized matrix is held in memory, and the float32 vectors
+used for re-scoring stay on disk in a memory-mapped `.npy`, so a query
+pages in just its candidate rows.
+"""
+
+from pathlib import Path
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from app.config import EMBEDDING_DIMENSIONS, EMBEDDING_MODEL
+
+PRECISIONS = ("float32", "float16", "int8")
+
+INDEX_FILE = "quantized_{precision}.npz"
+
+# Full-precision vectors for re-scoring, row-aligned with the index
+VECTORS_FILE = "vectors_float32.npy"
+
+
+def get_embeddings(dimensions: int | None = EMBEDDING_DIMENSIONS):
+    """
+    Create the embedding client used for both documents and queries.
+
+    Args:
+        dimensions (int | None): Shortened embedding size, or None for
+            the model's native size
+
+    Returns:
+        OpenAIEmbeddings: Configured embedding client
+    """
+    if dimensions:
+        return OpenAIEmbeddings(model=EMBEDDING_MODEL, dimensions=dimensions)
+    return OpenAIEmbeddings(model=EMBEDDING_MODEL)
+
+
+def truncate(vectors, dimensions: int) -> np.ndarray:
+    """
+    Shorten vectors to `dimensions` components and re-normalize.
+
+    Args:
+        vectors: Array-like of shape (n, d) or (d,)
+        dimensions (int): Target dimension count
+
+    Returns:
+        np.ndarray: Unit-length float32 vectors
+    """
+    arr = np.asarray(vectors, dtype=np.float32)[..., :dimensions]
+    norms = np.linalg.norm(arr, axis=-1, keepdims=True)
+    return arr / np.maximum(norms, 1e-12)
+
+
+def quantize(vectors, precision: str):
+    """
+    Convert float vectors to a compact storage type.
+
+    int8 uses symmetric per-vector scaling, so each row keeps its own
+    dynamic range.
+
+    Args:
+        vectors: Array-like of shape (n, d)
+        precision (str): One of `PRECISIONS`
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray | None]: Stored matrix and per-row
+        scales (None unless precision is int8)
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown embedding precision: {precision}")
+
+    arr = np.asarray(vectors, dtype=np.float32)
+
+    if precision == "float32":
+        return arr, None
+
+    if precision == "float16":
+        return arr.astype(np.float16), None
+
+    scales = np.abs(arr).max(axis=1) / 127.0
+    scales = np.maximum(scales, 1e-12).astype(np.float32)
+    data = np.round(arr / scales[:, None]).astype(np.int8)
+    return data, scales
+
+
+class QuantizedIndex:
+    """
+    Brute-force inner-product index over quantized vectors.
+
+    Vectors are assumed unit-normalized, so scores are cosine
+    similarities. Rows are scored in blocks to bound the temporary
+    float32 buffer created while up-casting the stored matrix.
+
+    Args:
+        ids (list[str]): Chroma ids, one per row
+        data (np.ndarray): Stored (possibly quantized) vectors
+        scales (np.ndarray | None): Per-row int8 scales
+        precision (str): Storage precision of `data`
+        vectors (np.ndarray | None): Full-precision vectors for
+            re-scoring (memory-mapped once loaded)
+    """
+
+    BLOCK_ROWS = 8192
+
+    def __init__(self, ids, data, scales=None, precision: str = "float32", vectors=None):
+        self.ids = np.asarray(ids)
+        self.data = data
+        self.scales = scales
+        self.precision = precision
+        self.vectors = vectors
+
+    @classmethod
+    def from_vectors(cls, ids, vectors, precision: str, keep_full: bool = True) -> "QuantizedIndex":
+        """
+        Quantize full-precision vectors into a new index.
+
+        Args:
+            ids (list[str]): One id per row
+            vectors: Array-like of shape (n, d)
+            precision (str): One of `PRECISIONS`
+            keep_full (bool): Keep the float32 vectors for re-scoring
+        """
+        full = np.asarray(vectors, dtype=np.float32)
+        data, scales = quantize(full, precision)
+        return cls(ids, data, scales, precision, full if keep_full else None)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the vector matrix and its scales."""
+        extra = self.scales.nbytes if self.scales is not None else 0
+        return int(self.data.nbytes + extra)
+
+    def row(self, i: int) -> np.ndarray:
+        """Float32 vector of a row, from the full vectors when present."""
+        if self.vectors is not None:
+            return np.asarray(self.vectors[i], dtype=np.float32)
+        vector = self.data[i].astype(np.float32)
+        return vector * self.scales[i] if self.scales is not None else vector
+
+    def scores(self, query) -> np.ndarray:
+        """
+        Score every row against a query vector.
+
+        Args:
+            query: Float query vector with the index's dimension count
+
+        Returns:
+            np.ndarray: One similarity per row
+        """
+        q = np.asarray(query, dtype=np.float32)
+        out = np.empty(len(self.data), dtype=np.float32)
+
+        for start in range(0, len(self.data), self.BLOCK_ROWS):
+            block = self.data[start:start + self.BLOCK_ROWS]
+            out[start:start + len(block)] = block.astype(np.float32) @ q
+
+        if self.scales is not None:
+            out *= self.scales
+
+        return out
+
+    def search(self, query, k: int, rescore_factor: int = 0):
+        """
+        Return the top-k rows for a query vector.
+
+        Args:
+            query: Float query vector
+            k (int): Results to return
+            rescore_factor (int): When > 0 and full vectors are present,
+                re-rank `k * rescore_factor` candidates by exact score
+
+        Returns:
+            list[tuple[str, float]]: (id, score) pairs, best first
+        """
+        scores = self.scores(query)
+        rescoring = rescore_factor > 0 and self.vectors is not None
+
+        n = min(k * rescore_factor if rescoring else k, len(scores))
+        if n <= 0:
+            return []
+
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top])]
+        top_scores = scores[top]
+
+        if rescoring:
+            top, top_scores = rescore(query, top, self.vectors)
+            top, top_scores = top[:k], top_scores[:k]
+
+        return [(str(self.ids[i]), float(s)) for i, s in zip(top, top_scores)]
+
+    def save(self, directory: str):
+        """Persist the index (and full vectors) next to the chunk store."""
+        directory = Path(directory)
+        arrays = {"ids": self.ids, "data": self.data}
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        np.savez(directory / INDEX_FILE.format(precision=self.precision), **arrays)
+
+        if self.vectors is not None:
+            np.save(directory / VECTORS_FILE, np.asarray(self.vectors, dtype=np.float32))
+
+    @classmethod
+    def load(cls, directory: str, precision: str) -> "QuantizedIndex":
+        """
+        Load an index written by `save`.
+
+        The quantized matrix is read into memory; the full vectors, if
+        saved, are memory-mapped read-only.
+        """
+        directory = Path(directory)
+        vectors_path = directory / VECTORS_FILE
+        vectors = np.load(vectors_path, mmap_mode="r") if vectors_path.exists() else None
+
+        with np.load(directory / INDEX_FILE.format(precision=precision)) as arrays:
+            scales = arrays["scales"] if "scales" in arrays else None
+            return cls(arrays["ids"], arrays["data"], scales, precision, vectors)
+
+    @staticmethod
+    def exists(directory, precision: str) -> bool:
+        """True when `directory` holds an index of this precision."""
+        return (Path(directory) / INDEX_FILE.format(precision=precision)).exists()
+
+    @classmethod
+    def open(cls, directory) -> "QuantizedIndex | None":
+        """Load the index of a version directory, if it has one."""
+        for precision in PRECISIONS:
+            if cls.exists(directory, precision):
+                return cls.load(directory, precision)
+        return None
+
+
+def rescore(query, rows, vectors):
+    """
+    Re-rank candidate rows with their full-precision vectors.
+
+    Only the candidate rows are read, so `vectors` can be a memory map.
+
+    Args:
+        query: Float query vector
+        rows (np.ndarray): Candidate row numbers
+        vectors (np.ndarray): Full-precision matrix, one row per vector
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Rows and exact scores, best first
+    """
+    rows = np.asarray(rows)
+    if not len(rows):
+        return rows, np.empty(0, dtype=np.float32)
+
+    q = np.asarray(query, dtype=np.float32)
+    # Sorted reads keep memory-map access sequential
+    order = np.argsort(rows)
+    exact = np.empty(len(rows), dtype=np.float32)
+    exact[order] = np.asarray(vectors[rows[order]], dtype=np.float32) @ q
+
+    best = np.argsort(-exact, kind="stable")
+    return rows[best], exact[best]
+
+
+def build_index(ids, vectors, precision: str, directory: str):
+    """
+    Build and persist a quantized index for a collection.
+
+    Args:
+        ids (list[str]): One id per vector
+        vectors: Full-precision document vectors
+        precision (str): Target precision (no-op for float32)
+        directory (str): Version directory of the collection
+
+    Returns:
+        QuantizedIndex | None: The saved index, or None for float32
+    """
+    if precision == "float32":
+        return None
+
+    index = QuantizedIndex.from_vectors(ids, vectors, precision)
+    index.save(directory)
+    return index
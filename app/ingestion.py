@@ -6,22 +6,32 @@ Responsibilities:
 - Clean and normalize raw HTML into text
 - Chunk text into semantically searchable units
 - Attach metadata for traceability and auditing
+- Drop near-duplicate chunks before embedding
 - Build and persist vector stores for retrieval tools
+- Build collections into versioned directories, validate them and
+  publish them atomically (blue/green)
+- Write the memory-mapped chunk text store used to build evidence
 
 This module is executed during setup / preprocessing,
 not during live agent execution.
 """
 
+import shutil
+import time
+
 import requests
 from bs4 import BeautifulSoup
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
 
+from app.chunk_store import ChunkStore
 from app.chunking import splitter
-from app.config import VECTORSTORE_DIR
+from app.config import EMBEDDING_PRECISION
+from app.dedup import MinHashDeduplicator
+from app.embeddings import QuantizedIndex, build_index, get_embeddings
+from app.stores import close_on_release, new_version_dir, prune, publish
 
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+embeddings = get_embeddings()
 
 
 def fetch_text(url: str) -> str:
@@ -60,20 +70,13 @@ def fetch_text(url: str) -> str:
 
 
 
-def build_vectorstore(
+def load_documents(
     urls: list[str],
-    collection: str,
     source_type: str,
     source_name: str
-):
+) -> list[Document]:
     """
-    Build and persist a vector store from a list of URLs.
-
-    For each URL:
-    - Fetch text
-    - Split into chunks
-    - Attach metadata
-    - Embed and store in Chroma
+    Fetch and chunk a list of URLs into metadata-tagged documents.
 
     Metadata fields:
     - url: original source URL
@@ -83,12 +86,11 @@ def build_vectorstore(
 
     Args:
         urls (list[str]): List of source URLs
-        collection (str): Vector store collection name
         source_type (str): Category of source
         source_name (str): Human-readable source name
 
     Returns:
-        Chroma: Persisted vector store instance
+        list[Document]: Chunked documents in URL order
     """
     documents = []
 
@@ -109,9 +111,177 @@ def build_vectorstore(
                 )
             )
 
-    return Chroma.from_documents(
-        documents,
-        embedding=embeddings,
-        persist_directory=f"{VECTORSTORE_DIR}/{collection}",
-        collection_name=collection
+    return documents
+
+
+def persist_documents(
+    documents: list[Document],
+    collection: str,
+    directory: str
+):
+    """
+    Embed documents and persist them for retrieval.
+
+    Chunk ids are row numbers into a memory-mapped chunk store written
+    alongside, so searches only need ids and scores from the index.
+    With float32 precision the vectors go into a Chroma collection that
+    holds ids and embeddings only; text and metadata live once, in the
+    chunk store. With float16 / int8 no Chroma collection is built: the
+    vectors are written as a quantized index plus memory-mapped float32
+    re-scoring vectors, which is all retrieval reads.
+
+    Args:
+        documents (list[Document]): Chunks to embed
+        collection (str): Vector store collection name
+        directory (str): Persist directory (a fresh version directory)
+
+    Returns:
+        Chroma | None: Persisted vector store, or None for a quantized build
+    """
+    ids = [str(row) for row in range(len(documents))]
+    vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+
+    if EMBEDDING_PRECISION == "float32":
+        store = close_on_release(Chroma(
+            persist_directory=str(directory),
+            embedding_function=embeddings,
+            collection_name=collection
+        ))
+        batch = store._client.get_max_batch_size()
+        for start in range(0, len(ids), batch):
+            store._collection.add(
+                ids=ids[start:start + batch],
+                embeddings=vectors[start:start + batch]
+            )
+    else:
+        store = None
+        build_index(ids, vectors, EMBEDDING_PRECISION, str(directory))
+
+    ChunkStore.write(directory, documents)
+    return store
+
+
+def validate_store(store, documents: list[Document], directory):
+    """
+    Sanity-check a freshly built store before it is published.
+
+    Checks that every chunk was written to both the vector index
+    (Chroma, or the quantized index when `store` is None) and the chunk
+    store, and that a sample query (the first chunk's opening text)
+    returns results.
+
+    Raises:
+        RuntimeError: If any check fails
+    """
+    if store is None:
+        index = QuantizedIndex.load(directory, EMBEDDING_PRECISION)
+        count = len(index)
+    else:
+        count = store._collection.count()
+    if count != len(documents):
+        raise RuntimeError(
+            f"expected {len(documents)} chunks, store holds {count}"
+        )
+
+    chunks = ChunkStore.open(directory)
+    if chunks is None or len(chunks) != len(documents):
+        raise RuntimeError("chunk store missing or incomplete")
+    chunks.close()
+
+    if not documents:
+        return
+
+    sample = embeddings.embed_query(documents[0].page_content[:200])
+    if store is None:
+        found = index.search(sample, 1)
+    else:
+        found = store._collection.query(query_embeddings=[sample], n_results=1)["ids"][0]
+    if not found:
+        raise RuntimeError("sample query returned no results")
+
+
+def build_collection(collection: str, documents: list[Document]) -> dict:
+    """
+    Build, validate and publish one collection version.
+
+    The build goes to a new version directory that no server reads
+    yet. Only after validation passes is the collection's CURRENT
+    pointer switched to it; a failed build is deleted and the live
+    version keeps serving. Safe to run in a worker process.
+
+    Args:
+        collection (str): Vector store collection name
+        documents (list[Document]): Deduplicated chunks to embed
+
+    Returns:
+        dict: Collection, version, chunk count and timings in seconds
+    """
+    directory = new_version_dir(collection)
+    started = time.perf_counter()
+    print(f"[{collection}] embedding {len(documents)} chunks into {directory.name}")
+
+    try:
+        store = persist_documents(documents, collection, directory)
+        built = time.perf_counter()
+        validate_store(store, documents, directory)
+    except Exception:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    publish(collection, directory)
+    prune(collection)
+
+    return {
+        "collection": collection,
+        "version": directory.name,
+        "chunks": len(documents),
+        "build_s": round(built - started, 2),
+        "validate_s": round(time.perf_counter() - built, 2),
+    }
+
+
+def build_vectorstore(
+    urls: list[str],
+    collection: str,
+    source_type: str,
+    source_name: str,
+    deduplicator: MinHashDeduplicator | None = None
+) -> dict:
+    """
+    Build and publish a vector store from a list of URLs.
+
+    For each URL:
+    - Fetch text
+    - Split into chunks
+    - Attach metadata
+    - Drop near-duplicate chunks
+    - Embed and store in Chroma (new version, validated, published)
+
+    Duplicates are removed within the collection by default. Pass a
+    shared `deduplicator` to also drop boilerplate already seen in
+    previously loaded collections; canonical chunks carry
+    `duplicate_count` and `duplicate_sources` metadata.
+
+    Args:
+        urls (list[str]): List of source URLs
+        collection (str): Vector store collection name
+        source_type (str): Category of source
+        source_name (str): Human-readable source name
+        deduplicator (MinHashDeduplicator | None): Shared dedup index
+
+    Returns:
+        dict: Build report from `build_collection`
+    """
+    dedup = deduplicator or MinHashDeduplicator()
+    before = dedup.duplicates
+
+    documents = load_documents(urls, source_type, source_name)
+    documents = dedup.deduplicate(documents, group=collection)
+
+    removed = dedup.duplicates - before
+    print(
+        f"[{collection}] {len(documents) + removed} chunks, "
+        f"{removed} near-duplicates removed"
     )
+
+    return build_collection(collection, documents)
@@ -5,11 +5,31 @@ Responsibilities:
 - Load environment variables
 - Initialize LLM clients
 - Fail fast if API key is missing
+- Admission control and priority scheduling of LLM calls
+
+Every client is wrapped in a `ScheduledLLM` that routes calls through a
+per-model `LLMScheduler`. The scheduler bounds in-flight requests and
+tokens per minute, admits waiting calls strictly by priority class
+(interactive > batch > retry), and rejects calls whose deadline has
+already passed instead of sending them late.
 """
 
+import heapq
+import itertools
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
+from openai import DEFAULT_MAX_RETRIES
 
 # Ensure .env is loaded before client creation
 load_dotenv()
@@ -18,18 +38,445 @@ if not os.getenv("OPENAI_API_KEY"):
     raise RuntimeError(
         "OPENAI_API_KEY not found. Ensure .env exists and is loaded."
     )
-__all__ = ["llm_fast", "llm_reasoning"]
+__all__ = [
+    "llm_fast",
+    "llm_reasoning",
+    "Priority",
+    "DeadlineExceeded",
+    "LLMScheduler",
+    "ScheduledLLM",
+    "llm_priority",
+    "scheduler_metrics",
+]
+
+# Completion tokens reserved per call until actual usage is known
+COMPLETION_TOKEN_ALLOWANCE = 512
+
+# Floor for the request timeout derived from a deadline, in seconds
+MIN_REQUEST_TIMEOUT = 0.05
+
+# Client methods that would reach the provider (or build a runnable that
+# does) without passing through the scheduler
+_UNSCHEDULED = frozenset({
+    "ainvoke", "astream", "abatch", "abatch_as_completed",
+    "batch_as_completed", "astream_events", "astream_log",
+    "transform", "atransform",
+    "with_structured_output", "bind", "bind_tools", "with_config",
+    "with_retry", "with_fallbacks", "with_listeners", "pipe",
+})
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are admitted first."""
+    INTERACTIVE = 0
+    BATCH = 1
+    RETRY = 2
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call cannot start, or finish, before its deadline."""
+
+
+_priority: ContextVar[Priority] = ContextVar(
+    "llm_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def llm_priority(priority: Priority):
+    """
+    Set the default priority of LLM calls made inside the block.
+
+    Example:
+        with llm_priority(Priority.BATCH):
+            run_agent(question)
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    # Cached even when unavailable so offline runs don't retry downloads
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def estimate_tokens(prompt: Any) -> int:
+    """
+    Estimate prompt tokens for rate limiting.
+
+    Falls back to a 4-characters-per-token heuristic when the tokenizer
+    is unavailable (e.g. offline without a cached encoding).
+    """
+    text = prompt if isinstance(prompt, str) else str(prompt)
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+class LLMScheduler:
+    """
+    Admission controller for calls to a single model.
+
+    Waiting calls form a priority queue ordered by (priority, arrival).
+    Only the head of the queue may be admitted, and only when an
+    in-flight slot is free and the token bucket holds enough tokens.
+
+    Args:
+        max_in_flight (int): Concurrent requests allowed to the model
+        tokens_per_minute (int): Token bucket capacity and refill rate
+        clock (Callable[[], float]): Monotonic time source
+        history (int): Wait-time samples kept for percentiles
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        tokens_per_minute: int = 200_000,
+        clock=time.monotonic,
+        history: int = 1000
+    ):
+        self.max_in_flight = max_in_flight
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._tokens = float(tokens_per_minute)
+        self._refilled = clock()
+
+        self._waits = {p: deque(maxlen=history) for p in Priority}
+        self._admitted = {p: 0 for p in Priority}
+        self._rejected = {p: 0 for p in Priority}
+
+    # =========================
+    # Token bucket
+    # =========================
+    def _refill(self, now: float):
+        elapsed = now - self._refilled
+        self._refilled = now
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + elapsed * self.tokens_per_minute / 60.0
+        )
+
+    def _token_wait(self, tokens: int) -> float:
+        missing = tokens - self._tokens
+        return max(0.0, missing * 60.0 / self.tokens_per_minute)
+
+    # =========================
+    # Admission
+    # =========================
+    def acquire(
+        self,
+        tokens: int,
+        priority: Priority = Priority.INTERACTIVE,
+        deadline: Optional[float] = None
+    ) -> int:
+        """
+        Block until the call may start.
+
+        Args:
+            tokens (int): Estimated tokens the call will consume
+            priority (Priority): Scheduling class
+            deadline (float | None): Absolute `clock()` time after which
+                the call is no longer useful
+
+        Returns:
+            int: Tokens reserved (pass to `release`)
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before admission
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+
+        with self._cond:
+            now = self._clock()
+            if deadline is not None and now >= deadline:
+                self._rejected[priority] += 1
+                raise DeadlineExceeded("deadline passed before queueing")
+
+            enqueued = now
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._queue, entry)
+
+            while True:
+                now = self._clock()
+                self._refill(now)
+
+                if deadline is not None and now >= deadline:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    self._rejected[priority] += 1
+                    self._cond.notify_all()
+                    raise DeadlineExceeded("deadline passed while queued")
+
+                timeout = None
+                if self._queue[0] is entry and self._in_flight < self.max_in_flight:
+                    timeout = self._token_wait(tokens)
+                    if timeout == 0.0:
+                        break
+
+                if deadline is not None:
+                    remaining = deadline - now
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+
+                self._cond.wait(timeout)
+
+            heapq.heappop(self._queue)
+            self._in_flight += 1
+            self._tokens -= tokens
+            self._admitted[priority] += 1
+            self._waits[priority].append(now - enqueued)
+
+            # The next waiter may be admissible too
+            self._cond.notify_all()
+
+        return tokens
+
+    def release(self, reserved: int, used: Optional[int] = None):
+        """
+        Free an in-flight slot.
+
+        Args:
+            reserved (int): Tokens reserved by `acquire`
+            used (int | None): Actual tokens consumed, if known; the
+                difference is returned to (or taken from) the bucket
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if used is not None:
+                self._refill(self._clock())
+                self._tokens = min(
+                    float(self.tokens_per_minute),
+                    self._tokens + reserved - used
+                )
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(
+        self,
+        tokens: int,
+        priority: Priority = Priority.INTERACTIVE,
+        deadline: Optional[float] = None
+    ):
+        """Context manager around `acquire` / `release`."""
+        reserved = self.acquire(tokens, priority, deadline)
+        try:
+            yield
+        finally:
+            self.release(reserved)
+
+    # =========================
+    # Metrics
+    # =========================
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of queue depth, in-flight calls and wait times.
+
+        Returns:
+            dict: Counters and per-priority wait percentiles in ms
+        """
+        def pct(samples, q):
+            if not samples:
+                return 0.0
+            ordered = sorted(samples)
+            return round(1000 * ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+        with self._cond:
+            depth = {p.name.lower(): 0 for p in Priority}
+            for priority, _ in self._queue:
+                depth[Priority(priority).name.lower()] += 1
+
+            return {
+                "in_flight": self._in_flight,
+                "queue_depth": sum(depth.values()),
+                "queue_depth_by_priority": depth,
+                "tokens_available": int(self._tokens),
+                "priorities": {
+                    p.name.lower(): {
+                        "admitted": self._admitted[p],
+                        "rejected": self._rejected[p],
+                        "wait_ms_p50": pct(self._waits[p], 0.50),
+                        "wait_ms_p95": pct(self._waits[p], 0.95),
+                    }
+                    for p in Priority
+                },
+            }
+
+
+class ScheduledLLM:
+    """
+    Chat model wrapper that admits every call through a scheduler.
+
+    Attribute access falls through to the wrapped client, so callers
+    keep using `.invoke(prompt).content` unchanged. `invoke`, `stream`
+    and `batch` are admitted by the scheduler; client methods that would
+    bypass it (async calls, `with_structured_output`, `bind`, ...) raise
+    AttributeError instead of silently skipping admission control.
+
+    Args:
+        llm: Underlying chat model (anything with `.invoke`)
+        scheduler (LLMScheduler): Scheduler for this model
+    """
+
+    def __init__(self, llm, scheduler: LLMScheduler):
+        self.llm = llm
+        self.scheduler = scheduler
+
+    def invoke(
+        self,
+        prompt,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None,
+        **kwargs
+    ):
+        """
+        Invoke the model once admitted.
+
+        The time left until `deadline` is passed to the provider as the
+        request timeout, so an attempt its caller has given up on frees
+        its in-flight slot at the deadline rather than whenever the
+        provider answers. A client that retries timed-out requests
+        itself gets the budget split across its attempts; deadline-bound
+        clients should be built with `max_retries=0` (as `llm_fast` is)
+        so the single attempt gets all of it and no retry backoff is
+        added on top.
+
+        Args:
+            prompt: Prompt passed to the underlying model
+            priority (Priority | None): Overrides the context priority
+            deadline (float | None): Absolute `time.monotonic()` deadline
+
+        Raises:
+            DeadlineExceeded: If the call could not start, or did not
+                finish, in time
+        """
+        priority = _priority.get() if priority is None else priority
+        estimate = estimate_tokens(prompt) + COMPLETION_TOKEN_ALLOWANCE
+        reserved = self.scheduler.acquire(estimate, priority, deadline)
+
+        if deadline is not None:
+            retries = getattr(self.llm, "max_retries", 0)
+            attempts = 1 + (DEFAULT_MAX_RETRIES if retries is None else retries)
+            timeout = (deadline - time.monotonic()) / attempts
+            kwargs.setdefault("timeout", max(timeout, MIN_REQUEST_TIMEOUT))
+
+        used = None
+        try:
+            response = self.llm.invoke(prompt, **kwargs)
+            usage = getattr(response, "usage_metadata", None)
+            if usage:
+                used = usage.get("total_tokens")
+            return response
+        except Exception as e:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineExceeded("provider call did not finish before the deadline") from e
+            raise
+        finally:
+            self.scheduler.release(reserved, used)
+
+    def stream(
+        self,
+        prompt,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None,
+        **kwargs
+    ):
+        """
+        Stream the model's reply once admitted.
+
+        The in-flight slot is held until the stream is exhausted or
+        closed.
+
+        Raises:
+            DeadlineExceeded: If the call could not start in time
+        """
+        priority = _priority.get() if priority is None else priority
+        estimate = estimate_tokens(prompt) + COMPLETION_TOKEN_ALLOWANCE
+        reserved = self.scheduler.acquire(estimate, priority, deadline)
+
+        try:
+            yield from self.llm.stream(prompt, **kwargs)
+        finally:
+            self.scheduler.release(reserved)
+
+    def batch(
+        self,
+        prompts,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Invoke the model on several prompts, each admitted separately.
+
+        Prompts run concurrently up to the scheduler's in-flight limit.
+
+        Returns:
+            list: Responses in prompt order
+        """
+        priority = _priority.get() if priority is None else priority
+        workers = max(1, min(len(prompts), self.scheduler.max_in_flight))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                lambda prompt: self.invoke(prompt, priority, deadline, **kwargs),
+                prompts
+            ))
+
+    def __getattr__(self, name):
+        if name in _UNSCHEDULED:
+            raise AttributeError(
+                f"{name}() would bypass admission control; "
+                "use invoke(), stream() or batch()"
+            )
+        return getattr(self.llm, name)
+
 
 # Primary low-latency LLM used for short-form tasks such as the
 # critic and judge prompts, quick clarifications, and retries.
-llm_fast: ChatOpenAI = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0
+# Its calls are deadline-bound and hedged by `invoke_json`, so the
+# client does not retry on its own (see `ScheduledLLM.invoke`).
+llm_fast: ScheduledLLM = ScheduledLLM(
+    ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0,
+        max_retries=0
+    ),
+    LLMScheduler(
+        max_in_flight=int(os.getenv("LLM_FAST_MAX_IN_FLIGHT", "16")),
+        tokens_per_minute=int(os.getenv("LLM_FAST_TPM", "200000"))
+    )
 )
 
 # Higher-capacity reasoning LLM intended for longer-form chain-of-thought
 # style reasoning when the agent needs deeper analysis.
-llm_reasoning: ChatOpenAI = ChatOpenAI(
-    model="gpt-4.1",
-    temperature=0
+llm_reasoning: ScheduledLLM = ScheduledLLM(
+    ChatOpenAI(
+        model="gpt-4.1",
+        temperature=0
+    ),
+    LLMScheduler(
+        max_in_flight=int(os.getenv("LLM_REASONING_MAX_IN_FLIGHT", "8")),
+        tokens_per_minute=int(os.getenv("LLM_REASONING_TPM", "30000"))
+    )
 )
+
+
+def scheduler_metrics() -> Dict[str, Dict[str, Any]]:
+    """Scheduler metrics for every configured model."""
+    return {
+        llm.llm.model_name: llm.scheduler.metrics()
+        for llm in (llm_fast, llm_reasoning)
+    }
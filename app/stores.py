@@ -0,0 +1,205 @@
+"""
+Versioned vector store layout.
+
+Responsibilities:
+- Allocate a fresh version directory for every collection build
+- Atomically publish a build through a "CURRENT" pointer file
+- Resolve the directory serving processes should read
+- Prune superseded versions
+- Give serving processes a store handle that follows the pointer
+
+Layout:
+    vectorstores/<collection>/CURRENT      -> name of the live version
+    vectorstores/<collection>/<version>/   -> Chroma files, or the quantized
+                                              index of a float16 / int8 build
+
+Collections without a pointer fall back to the legacy layout where the
+Chroma files live directly in `vectorstores/<collection>/`.
+"""
+
+import itertools
+import os
+import shutil
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import NamedTuple
+
+from langchain_chroma import Chroma
+
+from app.chunk_store import ChunkStore
+from app.config import VECTORSTORE_DIR
+from app.embeddings import QuantizedIndex
+
+POINTER_FILE = "CURRENT"
+CHROMA_FILE = "chroma.sqlite3"
+VERSION_PREFIX = "v"
+
+# Distinguishes builds started by one process within the same second
+_build_seq = itertools.count()
+
+
+def collection_root(collection: str) -> Path:
+    """Directory holding every version of a collection."""
+    return Path(VECTORSTORE_DIR) / collection
+
+
+def new_version_dir(collection: str) -> Path:
+    """
+    Create an empty, uniquely named version directory.
+
+    Names sort chronologically, so pruning can keep the newest ones.
+    """
+    root = collection_root(collection)
+    root.mkdir(parents=True, exist_ok=True)
+
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = root / f"{VERSION_PREFIX}{stamp}-{os.getpid()}-{next(_build_seq)}"
+    path.mkdir()
+    return path
+
+
+def current_version(collection: str) -> str | None:
+    """Name of the published version, or None for the legacy layout."""
+    pointer = collection_root(collection) / POINTER_FILE
+    try:
+        return pointer.read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def current_dir(collection: str) -> Path:
+    """Directory serving processes should open for a collection."""
+    version = current_version(collection)
+    root = collection_root(collection)
+    return root / version if version else root
+
+
+def publish(collection: str, version_dir: Path):
+    """
+    Atomically point a collection at a finished build.
+
+    The pointer is written to a temporary file and renamed over the old
+    one, so readers see either the previous or the new version.
+    """
+    root = collection_root(collection)
+    tmp = root / f".{POINTER_FILE}.{os.getpid()}"
+    tmp.write_text(Path(version_dir).name, encoding="utf-8")
+    os.replace(tmp, root / POINTER_FILE)
+
+
+def prune(collection: str, keep: int = 2) -> list[str]:
+    """
+    Delete old versions, keeping the newest `keep` and the live one.
+
+    Returns:
+        list[str]: Names of the removed versions
+    """
+    root = collection_root(collection)
+    live = current_version(collection)
+
+    versions = sorted(
+        p for p in root.iterdir()
+        if p.is_dir() and p.name.startswith(VERSION_PREFIX)
+    )
+
+    removed = []
+    for path in versions[:-keep] if keep else versions:
+        if path.name == live:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed.append(path.name)
+
+    return removed
+
+
+def close_on_release(store: Chroma) -> Chroma:
+    """
+    Close a Chroma store's client once the store is garbage collected.
+
+    chromadb keeps every client's system (loaded HNSW index, sqlite and
+    segment file handles) alive until the client is closed, so a store
+    that is simply dropped would pin its version directory forever.
+    """
+    weakref.finalize(store, store._client.close)
+    return store
+
+
+class StoreVersion(NamedTuple):
+    """One opened version of a collection (`store` is None for quantized builds)."""
+    store: Chroma | None
+    directory: Path
+    chunks: ChunkStore | None
+    index: QuantizedIndex | None = None
+
+
+class VersionedStore:
+    """
+    Chroma handle that follows a collection's CURRENT pointer.
+
+    Serving processes hold one handle per collection. At most every
+    `check_interval` seconds the pointer is re-read; when it names a new
+    version the store (and its chunk store) is reopened, so a published
+    build is picked up without a restart. Requests in flight keep the
+    version they got.
+
+    The handle drops a superseded version as soon as it is replaced.
+    Its quantized index goes with it. Its Chroma client is closed
+    (`close_on_release`) once no request in flight still uses it. Its
+    chunk store mapping and file are closed once the last request or
+    session holding hits from it lets go (see `ChunkStore`). Repeated
+    publishes therefore leave no HNSW index, mapping or file handle of
+    old versions behind.
+
+    Args:
+        collection (str): Collection name
+        embedding_function: Embeddings used for query-text searches
+        check_interval (float): Seconds between pointer checks
+    """
+
+    def __init__(self, collection: str, embedding_function, check_interval: float = 2.0):
+        self.collection = collection
+        self.embedding_function = embedding_function
+        self.check_interval = check_interval
+        self._version: StoreVersion | None = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path | None:
+        """Directory of the currently opened version."""
+        return self._version.directory if self._version else None
+
+    def current(self) -> StoreVersion:
+        """Return the live version, reopening it if the pointer moved."""
+        now = time.monotonic()
+        version = self._version
+        if version is not None and now - self._checked < self.check_interval:
+            return version
+
+        with self._lock:
+            self._checked = now
+            directory = current_dir(self.collection)
+
+            if self._version is None or directory != self._version.directory:
+                index = QuantizedIndex.open(directory)
+
+                store = None
+                # Quantized builds have no Chroma collection; opening one
+                # would create an empty database in the version directory
+                if (directory / CHROMA_FILE).exists() or index is None:
+                    store = close_on_release(Chroma(
+                        persist_directory=str(directory),
+                        embedding_function=self.embedding_function,
+                        collection_name=self.collection
+                    ))
+                self._version = StoreVersion(
+                    store, directory, ChunkStore.open(directory), index
+                )
+
+            return self._version
+
+    def get(self) -> Chroma | None:
+        """Return the Chroma store of the live version, if it has one."""
+        return self.current().store
@@ -0,0 +1,66 @@
+"""
+Score-aware adaptive-k selection of retrieval hits.
+
+Responsibilities:
+- Drop a tool's results entirely when its best hit is below a floor
+- Stop early at a relevance cutoff or a sharp score gap
+- Fetch deeper when the leading scores are tightly clustered
+
+This module does NOT perform retrieval; it only trims scored hits.
+"""
+
+from typing import List, Tuple
+
+from app.config import (
+    RETRIEVAL_BASE_K,
+    RETRIEVAL_CLUSTER_SPREAD,
+    RETRIEVAL_MAX_K,
+    RETRIEVAL_RELATIVE_CUTOFF,
+    RETRIEVAL_SCORE_FLOOR,
+    RETRIEVAL_SCORE_GAP,
+)
+
+
+def select_adaptive(
+    hits: List[Tuple[object, float]],
+    base_k: int = RETRIEVAL_BASE_K,
+    max_k: int = RETRIEVAL_MAX_K,
+    floor: float = RETRIEVAL_SCORE_FLOOR,
+    relative_cutoff: float = RETRIEVAL_RELATIVE_CUTOFF,
+    gap: float = RETRIEVAL_SCORE_GAP,
+    cluster_spread: float = RETRIEVAL_CLUSTER_SPREAD
+) -> List[Tuple[object, float]]:
+    """
+    Choose how many scored hits to keep.
+
+    Args:
+        hits (list[tuple[Document, float]]): Hits sorted by descending
+            similarity, at least `max_k` deep when available
+        base_k (int): Default number of hits
+        max_k (int): Upper bound when scores are tightly clustered
+        floor (float): Minimum best score for the tool to count at all
+        relative_cutoff (float): Maximum distance below the best score
+        gap (float): Maximum drop between consecutive hits
+        cluster_spread (float): Spread of the first `base_k` scores under
+            which the limit is raised to `max_k`
+
+    Returns:
+        list[tuple[Document, float]]: Kept hits, best first
+    """
+    if not hits or hits[0][1] < floor:
+        return []
+
+    top = hits[0][1]
+    cutoff = max(floor, top - relative_cutoff)
+
+    limit = base_k
+    if len(hits) >= base_k and top - hits[base_k - 1][1] <= cluster_spread:
+        limit = max_k
+
+    selected = [hits[0]]
+    for prev, cur in zip(hits, hits[1:limit]):
+        if cur[1] < cutoff or prev[1] - cur[1] > gap:
+            break
+        selected.append(cur)
+
+    return selected
@@ -0,0 +1,186 @@
+"""
+Query-focused evidence compression.
+
+Responsibilities:
+- Split each evidence entry into its citation header and sentences
+- Score sentences against the question by weighted term overlap
+- Keep the best sentences block-wide up to a target ratio
+- Report how much evidence was removed for the agent trace
+
+Runs locally on the CPU between evidence construction and reasoning.
+Citation headers are never altered, so every kept sentence can still
+be cited with its source, chunk and URL.
+"""
+
+import math
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from app.config import EVIDENCE_COMPRESSION_RATIO
+
+# Citation header written by `build_evidence`: [source|chunk](url)
+_HEADER = re.compile(r"^\[[^\]\n]*\|[^\]\n]*\]\([^)\n]*\)$", re.MULTILINE)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[A-Z0-9])|\n+")
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+
+_STOPWORDS = frozenset("""
+    a an and are as at be by can do does for from how i if in is it its
+    of on or should that the this to was what when where which who why
+    will with you your we our they their there these those not no into
+""".split())
+
+
+def _terms(text: str) -> List[str]:
+    """Lowercased content terms with a naive plural strip."""
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+def _split(evidence: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Split an evidence block into entries.
+
+    Returns:
+        Tuple[str, list[tuple[str, str]]]: Text before the first header
+        and (header, body) pairs
+    """
+    headers = list(_HEADER.finditer(evidence))
+    if not headers:
+        return evidence, []
+
+    preamble = evidence[:headers[0].start()]
+    entries = []
+    for i, match in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(evidence)
+        entries.append((match.group(), evidence[match.end():end].strip()))
+
+    return preamble, entries
+
+
+def _select(scores: List[List[float]], sizes: List[List[int]], budget: int) -> List[List[int]]:
+    """
+    Pick sentence indexes per entry within one shared character budget.
+
+    Every entry keeps its best sentence so no citation loses its
+    content. The rest of the budget goes to the highest-scoring
+    sentences across all entries, so chunks that match the question
+    keep more than distractors. Sentences sharing no term with the
+    question fill what is left in retrieval and reading order.
+    """
+    kept = [[] for _ in scores]
+    used = 0
+
+    for entry, entry_scores in enumerate(scores):
+        if entry_scores:
+            best = max(range(len(entry_scores)), key=lambda i: (entry_scores[i], -i))
+            kept[entry].append(best)
+            used += sizes[entry][best]
+
+    order = sorted(
+        (-score, entry, i)
+        for entry, entry_scores in enumerate(scores)
+        for i, score in enumerate(entry_scores)
+        if i not in kept[entry]
+    )
+    for _, entry, i in order:
+        if used + sizes[entry][i] > budget:
+            continue
+        kept[entry].append(i)
+        used += sizes[entry][i]
+
+    return [sorted(indexes) for indexes in kept]
+
+
+def compress_evidence(
+    evidence: str,
+    question: str,
+    ratio: float = EVIDENCE_COMPRESSION_RATIO
+) -> Tuple[str, Dict]:
+    """
+    Keep the sentences of each evidence entry most relevant to a question.
+
+    Sentences are scored by the inverse-document-frequency weight of the
+    question terms they contain (document = sentence across the whole
+    block), normalized by sentence length. Every entry keeps its best
+    sentence; the remaining budget of `ratio` of all snippet characters
+    goes to the best sentences block-wide. Kept sentences stay in their
+    original order under their unchanged citation header.
+
+    Args:
+        evidence (str): Evidence block from `build_evidence`
+        question (str): User question
+        ratio (float): Share of snippet characters to keep;
+            1 or more returns the evidence unchanged
+
+    Returns:
+        Tuple[str, dict]: Compressed evidence and compression statistics
+    """
+    start = time.perf_counter()
+    preamble, entries = _split(evidence)
+
+    stats = {
+        "ratio_target": ratio,
+        "original_chars": len(evidence),
+        "compressed_chars": len(evidence),
+        "ratio": 1.0,
+        "sentences_total": 0,
+        "sentences_kept": 0,
+    }
+
+    if ratio >= 1 or not entries:
+        stats["ms"] = round(1000 * (time.perf_counter() - start), 2)
+        return evidence, stats
+
+    split_bodies = [
+        [s.strip() for s in _SENTENCE_END.split(body) if s.strip()]
+        for _, body in entries
+    ]
+    sentence_terms = [[_terms(s) for s in sentences] for sentences in split_bodies]
+
+    total = sum(len(sentences) for sentences in split_bodies)
+    frequency = Counter(
+        term
+        for terms_list in sentence_terms
+        for terms in terms_list
+        for term in set(terms)
+    )
+    query = set(_terms(question))
+    idf = {
+        term: math.log(1 + total / frequency[term])
+        for term in query if frequency[term]
+    }
+
+    scores = [
+        [
+            sum(idf.get(term, 0.0) for term in set(terms)) / math.sqrt(1 + len(terms))
+            for terms in terms_list
+        ]
+        for terms_list in sentence_terms
+    ]
+    sizes = [[len(sentence) for sentence in sentences] for sentences in split_bodies]
+    budget = int(ratio * sum(len(body) for _, body in entries))
+
+    blocks = []
+    for (header, _), sentences, kept in zip(
+        entries, split_bodies, _select(scores, sizes, budget)
+    ):
+        stats["sentences_total"] += len(sentences)
+        stats["sentences_kept"] += len(kept)
+        blocks.append(header + "\n" + " ".join(sentences[i] for i in kept))
+
+    compressed = preamble + "\n\n".join(blocks)
+
+    stats["compressed_chars"] = len(compressed)
+    stats["ratio"] = round(len(compressed) / max(1, len(evidence)), 3)
+    stats["ms"] = round(1000 * (time.perf_counter() - start), 2)
+    return compressed, stats
@@ -11,6 +11,13 @@ This module does NOT perform reasoning or retrieval.
 """
 from app.tools.registry import TOOL_REGISTRY
 
+def _snippet(doc, chars: int) -> str:
+    snippet = getattr(doc, "snippet", None)
+    if snippet is not None:
+        return snippet(chars)
+    return doc.page_content[:chars]
+
+
 def build_evidence(docs, limit: int = 15) -> str:
     """
     Build a formatted evidence block from retrieved documents.
@@ -21,8 +28,11 @@ def build_evidence(docs, limit: int = 15) -> str:
     - Source URL
     - Truncated content snippet
 
+    Hits backed by the chunk store decode only the snippet bytes
+    instead of copying the full chunk text.
+
     Args:
-        docs (list[Document]): Retrieved LangChain documents
+        docs (list[Document | ChunkRef]): Retrieved documents
         limit (int): Maximum number of evidence entries
 
     Returns:
@@ -42,7 +52,7 @@ def build_evidence(docs, limit: int = 15) -> str:
         evidence_blocks.append(
             f"[{doc.metadata['source_name']}|{doc.metadata['chunk_id']}]"
             f"({doc.metadata['url']})\n"
-            f"{doc.page_content[:400]}"
+            f"{_snippet(doc, 400)}"
         )
 
         if len(evidence_blocks) >= limit:
@@ -50,6 +60,68 @@ def build_evidence(docs, limit: int = 15) -> str:
 
     return "\n\n".join(evidence_blocks)
 
+
+def retrieve_documents(tools: list, query: str, embedding=None) -> list:
+    """
+    Run the selected tools for one query.
+
+    Each document is tagged with the tool that returned it. Documents
+    carrying a similarity `score` are merged across tools best first,
+    so the evidence limit keeps the strongest chunks.
+
+    Args:
+        tools (list): List of tool names selected by the planner
+        query (str): Search query
+        embedding (list[float] | None): Precomputed query vector
+
+    Returns:
+        list[Document]: Retrieved documents, best score first
+    """
+    all_docs = []
+
+    for tool_name in tools:
+        tool = TOOL_REGISTRY.get(tool_name)
+        if not tool:
+            continue
+
+        for doc in tool["func"](query, embedding=embedding):
+            doc.metadata["tool"] = tool_name
+            all_docs.append(doc)
+
+    # Stable sort: unscored documents keep their tool order at the end
+    all_docs.sort(key=lambda d: -d.metadata.get("score", float("-inf")))
+    return all_docs
+
+
+def summarize_retrieval(tools: list, docs: list) -> dict:
+    """
+    Summarize retrieval per tool for the agent trace.
+
+    Args:
+        tools (list): Tool names selected by the planner
+        docs (list[Document]): Documents returned by `retrieve_documents`
+
+    Returns:
+        dict: Hit count and best score per tool, plus the tools whose
+        results were dropped for low relevance
+    """
+    summary = {name: {"hits": 0, "top_score": None} for name in tools}
+
+    for doc in docs:
+        entry = summary.get(doc.metadata.get("tool"))
+        if entry is None:
+            continue
+        entry["hits"] += 1
+        score = doc.metadata.get("score")
+        if score is not None and (entry["top_score"] is None or score > entry["top_score"]):
+            entry["top_score"] = score
+
+    return {
+        "tools": summary,
+        "dropped_tools": [name for name, entry in summary.items() if not entry["hits"]],
+    }
+
+
 def retrieve_and_build_evidence(
     tools: list,
     query: str,
@@ -66,14 +138,5 @@ def retrieve_and_build_evidence(
     Returns:
         str: Formatted evidence text
     """
-    all_docs = []
-
-    for tool_name in tools:
-        tool = TOOL_REGISTRY.get(tool_name)
-        if not tool:
-            continue
-
-        docs = tool["func"](query)
-        all_docs.extend(docs)
-
+    all_docs = retrieve_documents(tools, query)
     return build_evidence(all_docs, limit=limit)
\ No newline at end of file
@@ -4,38 +4,181 @@ Vector-based retrieval tools.
 Responsibilities:
 - Wrap each vector store as a self-describing tool
 - Expose retrieval capability without routing logic
+- Search quantized indexes (no Chroma) when reduced precision is configured
+- Keep a score-dependent number of hits (adaptive k)
+- Follow published store versions without a restart
+- Return lightweight hits backed by the memory-mapped chunk store
 """
 
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
-from app.config import VECTORSTORE_DIR
+from app.config import (
+    EMBEDDING_PRECISION,
+    EMBEDDING_RESCORE_FACTOR,
+    RETRIEVAL_MAX_K,
+)
+from app.embeddings import QuantizedIndex, get_embeddings
+from app.stores import StoreVersion, VersionedStore
+from app.tools.adaptive_k import select_adaptive
 from app.tools.registry import register_tool
 
-emb = OpenAIEmbeddings(model="text-embedding-3-small")
+emb = get_embeddings()
 
-vs_k8s = Chroma(
-    persist_directory=f"{VECTORSTORE_DIR}/k8s",
-    embedding_function=emb,
-    collection_name="k8s"
-)
+# Handles reopen their store when ingestion publishes a new version
+vs_k8s = VersionedStore("k8s", emb)
+vs_incidents = VersionedStore("incidents", emb)
+vs_policy = VersionedStore("policy", emb)
+vs_stackoverflow = VersionedStore("stackoverflow", emb)
 
-vs_incidents = Chroma(
-    persist_directory=f"{VECTORSTORE_DIR}/incidents",
-    embedding_function=emb,
-    collection_name="incidents"
-)
+STORE_HANDLES = (vs_k8s, vs_incidents, vs_policy, vs_stackoverflow)
 
-vs_policy = Chroma(
-    persist_directory=f"{VECTORSTORE_DIR}/policy",
-    embedding_function=emb,
-    collection_name="policy"
-)
+_spaces = {}
 
-vs_stackoverflow = Chroma(
-    persist_directory=f"{VECTORSTORE_DIR}/stackoverflow",
-    embedding_function=emb,
-    collection_name="stackoverflow"
-)
+
+def _similarity(store: Chroma, distance: float) -> float:
+    """
+    Convert a Chroma distance into cosine similarity.
+
+    Embeddings are unit-normalized, so squared L2 distance is
+    `2 - 2 * cos` and cosine / inner-product distance is `1 - cos`.
+    """
+    name = store._collection.name
+    if name not in _spaces:
+        try:
+            hnsw = store._collection.configuration.get("hnsw") or {}
+            _spaces[name] = hnsw.get("space") or "l2"
+        except AttributeError:
+            _spaces[name] = "l2"
+
+    if _spaces[name] == "l2":
+        return 1.0 - distance / 2.0
+    return 1.0 - distance
+
+
+def _mismatch(version: StoreVersion) -> RuntimeError:
+    return RuntimeError(
+        f"{version.directory} has no {EMBEDDING_PRECISION} index; "
+        "re-run ingestion with this EMBEDDING_PRECISION"
+    )
+
+
+def _chroma(version: StoreVersion) -> Chroma:
+    """Chroma store of a float32 version."""
+    if version.store is None:
+        raise _mismatch(version)
+    return version.store
+
+
+def _index(version: StoreVersion) -> QuantizedIndex:
+    """Quantized index of a store version (always built with a chunk store)."""
+    if (
+        version.index is None
+        or version.index.precision != EMBEDDING_PRECISION
+        or version.chunks is None
+    ):
+        raise _mismatch(version)
+    return version.index
+
+
+def _search(version: StoreVersion, query: str, k: int, embedding=None):
+    """
+    Run a scored similarity search against a store version.
+
+    A precomputed query `embedding` skips the embedding call, letting
+    callers reuse vectors across tools and conversation turns.
+    float32 stores use Chroma's own index. For float16 / int8 the
+    quantized index is searched instead and Chroma is not touched; when
+    re-scoring is enabled, `k * EMBEDDING_RESCORE_FACTOR` candidates are
+    re-ranked with their memory-mapped float32 vectors before the top
+    `k` are returned (indexes built without full vectors skip this).
+
+    When the version has a chunk store, the index is asked for ids and
+    distances only and hits are `ChunkRef`s into the mapped text. Only
+    float32 versions built before the chunk store existed return full
+    Documents from Chroma.
+
+    Raises:
+        RuntimeError: If the version was not built for the configured
+            EMBEDDING_PRECISION
+
+    Returns:
+        list[tuple[Document | ChunkRef, float]]: Hits with cosine
+        similarity, best first
+    """
+    chunks = version.chunks
+    query_vector = embedding if embedding is not None else emb.embed_query(query)
+
+    if EMBEDDING_PRECISION == "float32":
+        store = _chroma(version)
+        if chunks is None:
+            hits = store.similarity_search_by_vector_with_relevance_scores(
+                query_vector, k=k
+            )
+            return [(doc, _similarity(store, dist)) for doc, dist in hits]
+
+        result = store._collection.query(
+            query_embeddings=[query_vector],
+            n_results=k,
+            include=["distances"]
+        )
+        return [
+            (chunks.ref(int(cid)), _similarity(store, dist))
+            for cid, dist in zip(result["ids"][0], result["distances"][0])
+        ]
+
+    hits = _index(version).search(query_vector, k, EMBEDDING_RESCORE_FACTOR)
+    return [(chunks.ref(int(cid)), score) for cid, score in hits]
+
+
+def _retrieve(handle: VersionedStore, query: str, embedding=None):
+    """
+    Search a store and keep an adaptive number of hits.
+
+    The similarity of each kept hit is stored in `metadata["score"]`.
+    Returns an empty list when the best hit is below the score floor.
+    """
+    hits = select_adaptive(
+        _search(handle.current(), query, RETRIEVAL_MAX_K, embedding)
+    )
+
+    for doc, score in hits:
+        doc.metadata["score"] = round(score, 4)
+
+    return [doc for doc, _ in hits]
+
+
+def touch(handle: VersionedStore) -> int:
+    """
+    Open a store's live version and page its indexes into memory.
+
+    Runs one search with a stored vector, which loads the HNSW index
+    (or the quantized index), and prefetches the chunk text.
+
+    Returns:
+        int: Number of chunks in the collection
+    """
+    version = handle.current()
+
+    if EMBEDDING_PRECISION == "float32":
+        store = _chroma(version)
+        rows = store.get(limit=1, include=["embeddings"])
+        count = store._collection.count()
+        vector = rows["embeddings"][0] if len(rows["embeddings"]) else None
+    else:
+        index = _index(version)
+        count = len(index)
+        vector = index.row(0) if count else None
+
+    if vector is None:
+        return 0
+
+    vector = [float(x) for x in vector]
+    for doc, _ in _search(version, "", 1, embedding=vector):
+        _ = doc.page_content  # reads the chunk text / document payload
+
+    if version.chunks is not None:
+        version.chunks.prefetch()
+
+    return count
 
 
 @register_tool(
@@ -43,9 +186,9 @@ vs_stackoverflow = Chroma(
     description="Kubernetes concepts, RBAC, workloads, networking, cluster operations.",
     domains=["kubernetes", "rbac", "k8s"]
 )
-def search_kubernetes_docs(query: str):
+def search_kubernetes_docs(query: str, embedding=None):
     """Search Kubernetes documentation."""
-    return vs_k8s.similarity_search(query, k=6)
+    return _retrieve(vs_k8s, query, embedding=embedding)
 
 
 @register_tool(
@@ -53,9 +196,9 @@ def search_kubernetes_docs(query: str):
     description="Outages, postmortems, reliability incidents, root cause analysis.",
     domains=["incident", "outage", "postmortem"]
 )
-def search_incident_reports(query: str):
+def search_incident_reports(query: str, embedding=None):
     """Search incident reports."""
-    return vs_incidents.similarity_search(query, k=6)
+    return _retrieve(vs_incidents, query, embedding=embedding)
 
 
 @register_tool(
@@ -63,15 +206,15 @@ def search_incident_reports(query: str):
     description="GDPR, privacy, compliance, regulatory requirements.",
     domains=["gdpr", "compliance", "policy"]
 )
-def search_policy_docs(query: str):
+def search_policy_docs(query: str, embedding=None):
     """Search policy documents."""
-    return vs_policy.similarity_search(query, k=6)
+    return _retrieve(vs_policy, query, embedding=embedding)
 
 @register_tool(
     name="search_stackoverflow",
     description="Community Q&A for debugging, errors, and practical solutions.",
     domains=["stackoverflow", "error", "debugging"]
 )
-def search_stackoverflow(query: str):
+def search_stackoverflow(query: str, embedding=None):
     """Search StackOverflow posts."""
-    return vs_stackoverflow.similarity_search(query, k=6)
+    return _retrieve(vs_stackoverflow, query, embedding=embedding)
@@ -4,31 +4,57 @@ Gradio-based user interface for the Agentic RAG system.
 Responsibilities:
 - Provide a simple interactive UI for testing the agent
 - Forward user questions to the agent execution loop
+- Keep one conversation session per browser session
+- Warm the serving process up before accepting questions
 - Display the final answer and agent trace for auditability
 - Contain NO business, planning, or retrieval logic
 """
 
 import gradio as gr
 from typing import Tuple, Dict, Any
+from app import warmup
+from app.config import WARMUP_READY_TIMEOUT
 from app.agent.agent_loop import run_agent
+from app.agent.session import SESSIONS
+import app.tools.retrieval_tools  # noqa: F401  (registers the retrieval tools)
 
 
-def ask(question: str):
+def ask(question: str, request: gr.Request):
     """
     Handle a user question submitted from the UI.
 
+    Follow-up questions in the same browser session reuse the previous
+    plan and evidence.
+
     Args:
         question (str): Natural language question entered by the user
+        request (gr.Request): Gradio request (provides the session hash)
 
     Returns:
         Tuple:
             - str: Final agent answer or clarification question
             - Dict: Agent execution trace (plan, tools used)
     """
-    answer, trace = run_agent(question)
+    # Bounded, so a stuck warm-up degrades to cold serving instead of hanging
+    warmup.wait_until_ready(timeout=WARMUP_READY_TIMEOUT)
+
+    session_id = request.session_hash
+    answer, trace = run_agent(question, session=SESSIONS.get(session_id))
+    SESSIONS.enforce_limit(keep=session_id)
     return answer, trace
 
 
+def new_conversation(request: gr.Request):
+    """
+    Forget the conversation state of the current browser session.
+
+    Returns:
+        Tuple: Cleared question, answer and trace components
+    """
+    SESSIONS.reset(request.session_hash)
+    return "", "", None
+
+
 def launch():
     """
     Launch the Gradio application.
@@ -37,7 +63,12 @@ def launch():
     - Textbox for user questions
     - Markdown panel for the agent answer
     - JSON panel for agent trace (planner output, tools used)
+
+    Warm-up (see `WARMUP_ENABLED`) runs while the UI is built; the
+    server only starts listening once the process is ready.
     """
+    warmup.start()
+
     with gr.Blocks() as demo:
         gr.Markdown("# Agentic RAG – Enterprise Knowledge Analyst")
 
@@ -47,6 +78,7 @@ def launch():
         )
 
         askQns = gr.Button("Ask Agent")
+        newConv = gr.Button("New Conversation")
 
         answer = gr.Markdown(label="Answer")
         trace = gr.JSON(label="Agent Trace")
@@ -57,4 +89,15 @@ def launch():
             outputs=[answer, trace]
         )
 
+        newConv.click(
+            new_conversation,
+            outputs=[question, answer, trace]
+        )
+
+    # Bounded, so a stuck warm-up degrades to cold serving instead of hanging
+    warmup.wait_until_ready(timeout=WARMUP_READY_TIMEOUT)
+    if warmup.REPORT:
+        print(f"Warm-up finished in {warmup.REPORT['total_s']}s, "
+              f"errors: {warmup.REPORT['errors'] or 'none'}")
+
     demo.launch()
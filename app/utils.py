@@ -3,13 +3,17 @@ Utility helpers shared across the application.
 Currently responsible for loading prompt templates from disk.
 """
 
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def load_prompt(name: str) -> str:
     """
     Load a prompt template from the prompts directory.
 
+    Templates are read once per process and cached.
+
     Args:
         name (str): File name of the prompt (e.g., 'planner.txt')
 
@@ -0,0 +1,162 @@
+"""
+Serving-process warm-up.
+
+Responsibilities:
+- Open every registered collection in parallel and page in its indexes
+- Initialise the tokenizer and load all prompt templates
+- Open pooled keep-alive connections to the LLM and embedding endpoints
+- Expose a readiness flag the UI waits on before serving
+
+Every step is best-effort: a failure is recorded in the report and the
+process still becomes ready, serving cold for whatever did not warm.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.config import WARMUP_ENABLED
+from app.llms import estimate_tokens, llm_fast, llm_reasoning
+from app.utils import load_prompt
+
+READY = threading.Event()
+
+# Result of the last warm-up (step -> seconds, plus errors)
+REPORT: Dict = {}
+
+_thread: Optional[threading.Thread] = None
+
+
+def is_ready() -> bool:
+    """True once warm-up finished (or was disabled)."""
+    return READY.is_set()
+
+
+def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    """
+    Block until the process is ready; returns False on timeout.
+
+    Returns False at once when warm-up was never started, since nothing
+    would ever set the flag.
+    """
+    if _thread is None and not READY.is_set():
+        return False
+    return READY.wait(timeout)
+
+
+def _client_name(client) -> str:
+    return (
+        getattr(client, "model_name", None)
+        or getattr(client, "model", None)
+        or type(client).__name__
+    )
+
+
+def _open_connection(client):
+    """
+    Establish a pooled connection for a model client.
+
+    Stub providers expose `connect()`; OpenAI-backed LangChain clients
+    list models, which costs no tokens and leaves a keep-alive TLS
+    connection in the client's pool for the first real request.
+    """
+    if hasattr(client, "connect"):
+        return client.connect()
+
+    root = getattr(client, "root_client", None)
+    if root is None:
+        root = getattr(getattr(client, "client", None), "_client", None)
+    if root is None:
+        raise TypeError(f"no connection pool on {type(client).__name__}")
+    root.models.list()
+
+
+def warm_up(handles=None, clients=None) -> Dict:
+    """
+    Warm the serving process and mark it ready.
+
+    Args:
+        handles: Store handles to open (default: every retrieval tool's)
+        clients: Model clients to connect (default: both chat models
+            and the query embedder)
+
+    Returns:
+        dict: Seconds per step, chunks loaded per collection and errors
+    """
+    try:
+        report = _run(handles, clients)
+    finally:
+        # Never keep the UI waiting on a failed warm-up
+        READY.set()
+    return report
+
+
+def _run(handles, clients) -> Dict:
+    started = time.perf_counter()
+    report = {"seconds": {}, "collections": {}, "errors": {}}
+
+    def step(name, func, *args):
+        begin = time.perf_counter()
+        try:
+            result = func(*args)
+        except Exception as e:
+            report["errors"][name] = f"{type(e).__name__}: {e}"
+            result = None
+        report["seconds"][name] = round(time.perf_counter() - begin, 3)
+        return result
+
+    # Registers the tools and creates the embedder
+    from app.tools import retrieval_tools
+
+    if handles is None:
+        handles = retrieval_tools.STORE_HANDLES
+    if clients is None:
+        clients = (llm_fast.llm, llm_reasoning.llm, retrieval_tools.emb)
+
+    step("tokenizer", estimate_tokens, "warm up")
+    for path in sorted(Path("prompts").glob("*.txt")):
+        step(f"prompt:{path.name}", load_prompt, path.name)
+
+    # Disk loads and handshakes overlap on one pool
+    with ThreadPoolExecutor(max_workers=max(1, len(handles) + len(clients))) as pool:
+        stores = {
+            handle.collection: pool.submit(
+                step, f"store:{handle.collection}", retrieval_tools.touch, handle
+            )
+            for handle in handles
+        }
+        connections = [
+            pool.submit(step, f"connect:{_client_name(c)}", _open_connection, c)
+            for c in clients
+        ]
+        for collection, future in stores.items():
+            report["collections"][collection] = future.result()
+        for future in connections:
+            future.result()
+
+    report["total_s"] = round(time.perf_counter() - started, 3)
+
+    REPORT.clear()
+    REPORT.update(report)
+    return report
+
+
+def start(enabled: bool = WARMUP_ENABLED) -> Optional[threading.Thread]:
+    """
+    Start warm-up in a background thread, or mark ready when disabled.
+
+    Returns:
+        Thread | None: The warm-up thread, if one was started
+    """
+    global _thread
+
+    if not enabled:
+        READY.set()
+        return None
+
+    if _thread is None:
+        _thread = threading.Thread(target=warm_up, name="warmup", daemon=True)
+        _thread.start()
+    return _thread
@@ -0,0 +1,7 @@
+"""
+`benchmarks` package.
+
+Offline performance harnesses. Each module is runnable with
+`python -m benchmarks.<name>` and prints a human-readable table plus
+machine-readable JSON so results can be compared across commits.
+"""
@@ -0,0 +1,157 @@
+"""
+Embedding dimension / precision benchmark.
+
+Compares every (dimensions, precision, re-scoring) setting against an
+exact full-precision search and reports:
+- recall@k relative to the full-precision top-k
+- memory held by the search matrix, and the on-disk size of the
+  memory-mapped float32 re-scoring vectors
+- mean and p95 query latency
+
+Each index is saved and loaded back the way retrieval serves it, so
+re-scoring reads its candidate rows from the memory-mapped `.npy`.
+
+Vectors come from a persisted collection (`--collection k8s`) or, by
+default, from a deterministic synthetic corpus. Synthetic vectors spread
+information evenly across components, so they understate how well
+`text-embedding-3` embeddings survive truncation; use a real collection
+when choosing `EMBEDDING_DIMENSIONS`.
+
+Usage:
+    python -m benchmarks.embedding_precision [--collection k8s] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from app.embeddings import PRECISIONS, VECTORS_FILE, QuantizedIndex, truncate  # noqa: E402
+
+DIMENSIONS = (1536, 1024, 768, 512, 256)
+
+
+def synthetic_vectors(n: int, dim: int = 1536, clusters: int = 64, seed: int = 0):
+    """Clustered unit vectors roughly shaped like a document corpus."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    vectors = centers[labels] + 0.8 * rng.normal(size=(n, dim)).astype(np.float32)
+    return truncate(vectors, dim)
+
+
+def collection_vectors(collection: str):
+    """Load the stored full-precision vectors of a collection."""
+    from app.stores import VersionedStore
+
+    version = VersionedStore(collection, embedding_function=None).current()
+    if version.store is None:
+        # Quantized build: the re-scoring vectors are the full vectors
+        return np.load(version.directory / VECTORS_FILE)
+
+    rows = version.store.get(include=["embeddings"])
+    return np.asarray(rows["embeddings"], dtype=np.float32)
+
+
+def exact_top_k(corpus, queries, k: int):
+    """Ground-truth neighbours from an exact float32 search."""
+    scores = queries @ corpus.T
+    return [set(np.argsort(-row)[:k]) for row in scores]
+
+
+def run(corpus, queries, k: int = 6, rescore_factor: int = 4):
+    """
+    Benchmark every setting.
+
+    Returns:
+        list[dict]: One result row per setting
+    """
+    truth = exact_top_k(corpus, queries, k)
+    ids = [str(i) for i in range(len(corpus))]
+    results = []
+
+    for dims in DIMENSIONS:
+        if dims > corpus.shape[1]:
+            continue
+
+        reduced = truncate(corpus, dims)
+        reduced_queries = truncate(queries, dims)
+
+        for precision in PRECISIONS:
+            factors = (0,) if precision == "float32" else (0, rescore_factor)
+
+            with tempfile.TemporaryDirectory() as directory:
+                QuantizedIndex.from_vectors(
+                    ids, reduced, precision, keep_full=precision != "float32"
+                ).save(directory)
+                index = QuantizedIndex.load(directory, precision)
+
+                for factor in factors:
+                    latencies, hits = [], 0
+
+                    for query, expected in zip(reduced_queries, truth):
+                        start = time.perf_counter()
+                        found = index.search(query, k, factor)
+                        latencies.append(time.perf_counter() - start)
+
+                        hits += len(expected & {int(cid) for cid, _ in found})
+
+                    results.append({
+                        "dimensions": dims,
+                        "precision": precision,
+                        "rescore": bool(factor),
+                        f"recall@{k}": round(hits / (k * len(queries)), 4),
+                        "memory_bytes": index.nbytes,
+                        "rescore_mapped_bytes": index.vectors.nbytes if factor else 0,
+                        "latency_ms_mean": round(1000 * float(np.mean(latencies)), 3),
+                        "latency_ms_p95": round(
+                            1000 * float(np.percentile(latencies, 95)), 3
+                        ),
+                    })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--collection", help="Persisted collection to load")
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    if args.collection:
+        vectors = collection_vectors(args.collection)
+    else:
+        vectors = synthetic_vectors(args.size + args.queries)
+
+    queries, corpus = vectors[:args.queries], vectors[args.queries:]
+    results = run(corpus, queries, k=args.k)
+
+    print(f"{len(corpus)} vectors, {len(queries)} queries, k={args.k}")
+    for row in results:
+        print(
+            f"{row['dimensions']:>5}d {row['precision']:>8} "
+            f"rescore={str(row['rescore']):<5} "
+            f"recall={row[f'recall@{args.k}']:.3f} "
+            f"mem={row['memory_bytes'] / 2**20:7.2f}MiB "
+            f"mapped={row['rescore_mapped_bytes'] / 2**20:7.2f}MiB "
+            f"p95={row['latency_ms_p95']:.2f}ms"
+        )
+
+    payload = json.dumps({"k": args.k, "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Evaluation mode benchmark.
+
+Runs the full agent loop (`run_agent`) over the offline snapshot
+questions, once with `EVALUATION_MODE=separate` (critic + judge calls)
+and once with `EVALUATION_MODE=combined` (one evaluator call), against
+stub models whose latency grows with prompt length. Retrieval returns
+the snapshot chunks of each question. A seeded scenario decides which
+questions trigger a critic revision and which a judge retry, identically
+in both modes, so every branch of the loop is exercised.
+
+Reports per request:
+- LLM calls (all stages) and evaluation calls
+- estimated prompt tokens (all stages) and evaluation prompt tokens
+- p50 / p95 end-to-end latency
+- revisions, retries, and whether both modes took the same decisions
+
+Usage:
+    python -m benchmarks.evaluation [--repeat 3] [--revision-rate 0.2] [--review-rate 0.2] [--output results.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import time
+from collections import Counter, defaultdict
+
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from app.agent import agent_loop, llm_calls  # noqa: E402
+from app.llms import LLMScheduler, estimate_tokens, llm_fast, llm_reasoning  # noqa: E402
+from benchmarks.evidence_compression import load_snapshot, question_documents  # noqa: E402
+from benchmarks.stubs import StubLLM, patched  # noqa: E402
+
+MODES = ("separate", "combined")
+
+# First line of each prompt template -> stage
+STAGE_MARKERS = {
+    "You are an Agent Planner": "planner",
+    "You are a logical critic": "critic",
+    "You are an impartial evaluator": "judge",
+    "You are an impartial reviewer": "evaluator",
+    "You are refining a previous answer": "retry",
+    "You are an Enterprise Knowledge Analyst": "reasoner",
+}
+EVALUATION_STAGES = ("critic", "judge", "evaluator")
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ScenarioReplies:
+    """
+    Prompt-aware replies for the stub models.
+
+    A seeded sample of `rate * len(questions)` questions is marked for
+    revision, and independently for review. The
+    critic asks for a revision of the first answer only; the judge
+    rejects every answer except the retried one. Prompt tokens are
+    counted per stage.
+    """
+
+    def __init__(self, questions, revision_rate: float, review_rate: float, seed: int):
+        rng = random.Random(seed)
+        revise = set(rng.sample(questions, round(revision_rate * len(questions))))
+        review = set(rng.sample(questions, round(review_rate * len(questions))))
+        self.scenario = {q: (q in revise, q in review) for q in questions}
+        self.tokens = Counter()
+        self.calls = Counter()
+        self._answers = Counter()
+
+    def reset(self):
+        self.tokens.clear()
+        self.calls.clear()
+        self._answers.clear()
+
+    def __call__(self, prompt: str) -> str:
+        stage = next(
+            (name for marker, name in STAGE_MARKERS.items() if prompt.startswith(marker)),
+            "other"
+        )
+        self.calls[stage] += 1
+        self.tokens[stage] += estimate_tokens(prompt)
+
+        question = next((q for q in self.scenario if q in prompt), None)
+        revise, review = self.scenario.get(question, (False, False))
+
+        if stage == "planner":
+            # A new request for this question starts
+            self._answers[question] = 0
+            return json.dumps({
+                "intent": "lookup",
+                "subquestions": [],
+                "tools": ["snapshot"],
+                "need_clarification": False,
+                "clarification_question": None,
+            })
+        if stage in ("reasoner", "retry"):
+            self._answers[question] += 1
+            version = "retried" if stage == "retry" else f"v{self._answers[question]}"
+            return f"[{version}] Answer to: {question}"
+
+        first = "[v1]" in prompt
+        retried = "[retried]" in prompt
+        critic = {"needs_revision": revise and first, "rationale": "checked"}
+        judge = {
+            "score": 0.9 if retried or not review else 0.5,
+            "grounded": True,
+            "relevant": True,
+            "well_cited": True,
+            "confidence": "high",
+            "verdict": "approve" if retried or not review else "needs_review",
+            "rationale": "scored",
+        }
+
+        if stage == "critic":
+            return json.dumps(critic)
+        if stage == "judge":
+            return json.dumps(judge)
+        return json.dumps({
+            "needs_revision": critic["needs_revision"],
+            "critic_rationale": critic["rationale"],
+            **judge,
+        })
+
+
+def run(mode: str, snapshot: dict, replies: ScenarioReplies, args) -> dict:
+    """Run every question `args.repeat` times in one evaluation mode."""
+    docs = {case["question"]: question_documents(snapshot, case) for case in snapshot["questions"]}
+    fast = StubLLM(latency=args.latency, reply=replies, per_token=args.per_token)
+    reasoning = StubLLM(latency=4 * args.latency, reply=replies, per_token=args.per_token)
+
+    latencies, decisions = [], {}
+    replies.reset()
+
+    with patched(
+        (agent_loop, "EVALUATION_MODE", mode),
+        (agent_loop, "retrieve_documents", lambda tools, query, embedding=None: docs[query]),
+        (llm_calls, "MIN_HEDGE_SAMPLES", 10**9),
+        (llm_fast, "llm", fast),
+        (llm_fast, "scheduler", LLMScheduler(max_in_flight=8, tokens_per_minute=10**9)),
+        (llm_reasoning, "llm", reasoning),
+        (llm_reasoning, "scheduler", LLMScheduler(max_in_flight=8, tokens_per_minute=10**9)),
+    ):
+        for _ in range(args.repeat):
+            for question in docs:
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, trace = agent_loop.run_agent(question)
+                latencies.append(time.perf_counter() - started)
+                decisions[question] = (
+                    bool(trace.get("critic_revision")),
+                    bool(trace.get("auto_retry")),
+                    trace["judge"]["verdict"],
+                )
+
+    requests = len(latencies)
+    per_request = defaultdict(float)
+    for stage, count in replies.calls.items():
+        per_request["calls"] += count / requests
+        if stage in EVALUATION_STAGES:
+            per_request["evaluation_calls"] += count / requests
+    for stage, tokens in replies.tokens.items():
+        per_request["prompt_tokens"] += tokens / requests
+        if stage in EVALUATION_STAGES:
+            per_request["evaluation_prompt_tokens"] += tokens / requests
+
+    return {
+        "mode": mode,
+        "requests": requests,
+        "llm_calls_per_request": round(per_request["calls"], 2),
+        "evaluation_calls_per_request": round(per_request["evaluation_calls"], 2),
+        "prompt_tokens_per_request": round(per_request["prompt_tokens"], 1),
+        "evaluation_prompt_tokens_per_request": round(per_request["evaluation_prompt_tokens"], 1),
+        "latency_ms_p50": round(1000 * _percentile(latencies, 0.50), 1),
+        "latency_ms_p95": round(1000 * _percentile(latencies, 0.95), 1),
+        "revisions": sum(d[0] for d in decisions.values()),
+        "retries": sum(d[1] for d in decisions.values()),
+        "_decisions": decisions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02, help="Base fast-model latency (s)")
+    parser.add_argument("--per-token", type=float, default=0.00002, help="Seconds per prompt token")
+    parser.add_argument("--revision-rate", type=float, default=0.2)
+    parser.add_argument("--review-rate", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    snapshot = load_snapshot()
+    replies = ScenarioReplies(
+        [case["question"] for case in snapshot["questions"]],
+        args.revision_rate, args.review_rate, args.seed
+    )
+    results = [run(mode, snapshot, replies, args) for mode in MODES]
+
+    same = results[0].pop("_decisions") == results[1].pop("_decisions")
+
+    for row in results:
+        print(
+            f"{row['mode']:>8}: calls={row['llm_calls_per_request']:.2f} "
+            f"(evaluation {row['evaluation_calls_per_request']:.2f}) "
+            f"tokens={row['prompt_tokens_per_request']:.0f} "
+            f"(evaluation {row['evaluation_prompt_tokens_per_request']:.0f}) "
+            f"p50={row['latency_ms_p50']:.0f}ms p95={row['latency_ms_p95']:.0f}ms "
+            f"revisions={row['revisions']} retries={row['retries']}"
+        )
+    print(f"identical revision / retry decisions: {same}")
+
+    payload = json.dumps({"same_decisions": same, "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
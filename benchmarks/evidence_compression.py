@@ -0,0 +1,187 @@
+"""
+Evidence compression benchmark.
+
+Builds the evidence block for every question of the offline snapshot
+(`benchmarks/data/snapshot.json`): its relevant chunks plus the other
+chunks of the same sources as distractors. Each block is compressed at
+several ratios and the benchmark reports:
+- characters and estimated tokens kept
+- answer-fact recall (labelled facts still present in the evidence)
+- compression time
+- prompt tokens saved across the reasoner, critic and judge prompts
+
+With `--live`, the reasoner and judge also run on the full and on the
+compressed evidence (requires OPENAI_API_KEY and network access) to
+measure end-to-end latency and the judge-score impact.
+
+Usage:
+    python -m benchmarks.evidence_compression [--ratios 1,0.7,0.5,0.35] [--live] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from langchain_core.documents import Document  # noqa: E402
+
+from app.llms import estimate_tokens  # noqa: E402
+from app.tools.compression import compress_evidence  # noqa: E402
+from app.tools.evidence import build_evidence  # noqa: E402
+
+SNAPSHOT = Path(__file__).parent / "data" / "snapshot.json"
+
+# Prompts that carry the evidence block once per answered question
+EVIDENCE_PROMPTS = ("reasoner", "critic", "judge")
+
+
+def load_snapshot(path: Path = SNAPSHOT) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def to_document(row: dict) -> Document:
+    return Document(
+        page_content=row["text"],
+        metadata={
+            "url": row["url"],
+            "chunk_id": row["chunk_id"],
+            "source_name": row["source_name"],
+            "source_type": row["source_type"],
+        },
+    )
+
+
+def question_documents(snapshot: dict, case: dict) -> list:
+    """Relevant chunks first, then same-source distractors."""
+    by_id = {row["id"]: row for row in snapshot["documents"]}
+    sources = {by_id[rid]["source_name"] for rid in case["relevant"]}
+
+    rows = [by_id[rid] for rid in case["relevant"]]
+    rows += [
+        row for row in snapshot["documents"]
+        if row["source_name"] in sources and row["id"] not in case["relevant"]
+    ]
+    return [to_document(row) for row in rows]
+
+
+def question_evidence(snapshot: dict, case: dict) -> str:
+    """Evidence block for a question, as `build_evidence` formats it."""
+    return build_evidence(question_documents(snapshot, case))
+
+
+def fact_recall(evidence: str, facts: list) -> float:
+    return sum(fact.lower() in evidence.lower() for fact in facts) / len(facts)
+
+
+def run(snapshot: dict, ratios) -> list:
+    """
+    Compress every question's evidence at every ratio.
+
+    Returns:
+        list[dict]: One result row per ratio
+    """
+    cases = [
+        (case, question_evidence(snapshot, case))
+        for case in snapshot["questions"]
+    ]
+    results = []
+
+    for ratio in ratios:
+        chars, tokens, full_tokens, recalls, timings = [], [], [], [], []
+
+        for case, evidence in cases:
+            compressed, stats = compress_evidence(evidence, case["question"], ratio=ratio)
+            chars.append(stats["ratio"])
+            tokens.append(estimate_tokens(compressed))
+            full_tokens.append(estimate_tokens(evidence))
+            recalls.append(fact_recall(compressed, case["facts"]))
+            timings.append(stats["ms"])
+
+        saved = statistics.mean(full_tokens) - statistics.mean(tokens)
+        results.append({
+            "ratio_target": ratio,
+            "char_ratio": round(statistics.mean(chars), 3),
+            "evidence_tokens_mean": round(statistics.mean(tokens), 1),
+            "fact_recall": round(statistics.mean(recalls), 3),
+            "compress_ms_mean": round(statistics.mean(timings), 3),
+            "prompt_tokens_saved_per_question": round(saved * len(EVIDENCE_PROMPTS), 1),
+        })
+
+    return results
+
+
+def run_live(snapshot: dict, ratio: float) -> list:
+    """Reason and judge on full versus compressed evidence."""
+    from app.agent.judge import judge_answer
+    from app.agent.reasoner import reason
+
+    results = []
+    for label, target in (("full", 1.0), ("compressed", ratio)):
+        latencies, scores = [], []
+
+        for case in snapshot["questions"]:
+            evidence, _ = compress_evidence(
+                question_evidence(snapshot, case), case["question"], ratio=target
+            )
+            start = time.perf_counter()
+            answer = reason(case["question"], evidence)
+            judge = judge_answer(case["question"], answer, evidence)
+            latencies.append(time.perf_counter() - start)
+            scores.append(float(judge["score"]))
+
+        results.append({
+            "evidence": label,
+            "ratio_target": target,
+            "latency_s_mean": round(statistics.mean(latencies), 2),
+            "judge_score_mean": round(statistics.mean(scores), 3),
+        })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ratios", default="1,0.7,0.5,0.35,0.25")
+    parser.add_argument("--live", action="store_true", help="Call the reasoner and judge")
+    parser.add_argument("--live-ratio", type=float, default=0.5)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    snapshot = load_snapshot()
+    ratios = [float(r) for r in args.ratios.split(",")]
+    results = run(snapshot, ratios)
+
+    print(f"{len(snapshot['questions'])} questions")
+    for row in results:
+        print(
+            f"ratio={row['ratio_target']:<5} kept={row['char_ratio']:.2f} "
+            f"tokens={row['evidence_tokens_mean']:7.1f} "
+            f"fact_recall={row['fact_recall']:.3f} "
+            f"compress={row['compress_ms_mean']:.2f}ms "
+            f"saved={row['prompt_tokens_saved_per_question']:.0f} tok/question"
+        )
+
+    payload = {"results": results}
+    if args.live:
+        payload["live"] = run_live(snapshot, args.live_ratio)
+        for row in payload["live"]:
+            print(
+                f"{row['evidence']:>10}: latency={row['latency_s_mean']}s "
+                f"judge={row['judge_score_mean']}"
+            )
+
+    payload = json.dumps(payload, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Hedged LLM call benchmark.
+
+Runs the same sequence of JSON calls through `invoke_json` against a
+stub provider with injected slow and malformed responses, once without
+hedging and once with it, and reports latency percentiles, hedge rate,
+malformed retries and the extra provider load hedging costs.
+
+Usage:
+    python -m benchmarks.hedging [--requests 1000] [--slow-rate 0.05] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from app.agent import llm_calls  # noqa: E402
+from benchmarks.stubs import StubLLM  # noqa: E402
+
+REPLY = json.dumps({"verdict": "approve", "score": 0.9, "rationale": "ok"})
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(hedge: bool, requests: int, args) -> dict:
+    """Run one configuration and summarize it."""
+    llm_calls.reset_call_stats()
+    stub = StubLLM(
+        latency=args.latency,
+        jitter=args.latency / 2,
+        reply=REPLY,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed
+    )
+
+    # Populate the latency window so hedging is active from the first
+    # measured request
+    for _ in range(llm_calls.MIN_HEDGE_SAMPLES):
+        llm_calls.invoke_json("prompt", stage="warmup", llm=stub, hedge=False)
+    llm_calls._stage_stats("bench").latencies.extend(
+        llm_calls._stage_stats("warmup").latencies
+    )
+    stub.calls = 0
+
+    latencies, failures = [], 0
+    for _ in range(requests):
+        start = time.monotonic()
+        try:
+            llm_calls.invoke_json("prompt", stage="bench", llm=stub, hedge=hedge)
+        except Exception:
+            failures += 1
+        latencies.append(time.monotonic() - start)
+
+    stats = llm_calls.call_stats()["bench"]
+    return {
+        "hedge": hedge,
+        "requests": requests,
+        "failures": failures,
+        "latency_ms_p50": round(1000 * _percentile(latencies, 0.50), 1),
+        "latency_ms_p95": round(1000 * _percentile(latencies, 0.95), 1),
+        "latency_ms_p99": round(1000 * _percentile(latencies, 0.99), 1),
+        "hedge_rate": stats["hedge_rate"],
+        "hedge_wins": stats["hedge_wins"],
+        "malformed_retries": stats["malformed"],
+        "provider_calls_per_request": round(stub.calls / requests, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=0.5)
+    parser.add_argument("--malformed-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    results = [run(False, args.requests, args), run(True, args.requests, args)]
+
+    for row in results:
+        print(
+            f"hedge={str(row['hedge']):<5} "
+            f"p50={row['latency_ms_p50']:7.1f}ms "
+            f"p95={row['latency_ms_p95']:7.1f}ms "
+            f"p99={row['latency_ms_p99']:7.1f}ms "
+            f"hedge_rate={row['hedge_rate']:.3f} "
+            f"calls/req={row['provider_calls_per_request']:.2f} "
+            f"failures={row['failures']}"
+        )
+
+    payload = json.dumps({"results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""
+Retrieval benchmark and regression check.
+
+Builds every collection from the offline snapshot
+(`benchmarks/data/snapshot.json`) through the real ingestion path -
+chunking, chunk store, Chroma or quantized indexes - using the
+deterministic `HashEmbeddings` in place of the OpenAI embedder. Each
+labelled question then runs through the retrieval tool of its source,
+once per vector backend (float32 Chroma HNSW, float16 and int8
+quantized indexes re-scored from memory-mapped float32 vectors), and
+the benchmark reports:
+- recall@k: share of the question's answer facts found in the top k
+- MRR: reciprocal rank of the first chunk containing an answer fact
+- p50 / p95 search latency (query vector precomputed)
+- index build time, resident index memory, and the on-disk serving
+  footprint of every version directory (Chroma files, quantized index,
+  re-scoring vectors and chunk store, also broken down per part)
+
+The stand-in embedder's similarities sit well below those of
+`text-embedding-3`, so the adaptive-k score floor defaults to 0 here
+(`--score-floor`); the relative cutoff, gap and clustering rules still
+apply.
+
+Relevance is judged by answer-fact text rather than chunk ids, so the
+numbers stay comparable when `--chunk-size` / `--chunk-overlap` change.
+Results are written as JSON; `--baseline` compares quality against a
+previous run and exits non-zero on a regression.
+
+Usage:
+    python -m benchmarks.retrieval [--chunk-size 900] [--chunk-overlap 150]
+        [--backends float32,float16,int8] [--score-floor 0] [--output results.json]
+        [--baseline previous.json] [--tolerance 0.02]
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter  # noqa: E402
+
+from app import ingestion, stores  # noqa: E402
+from app.config import RETRIEVAL_BASE_K  # noqa: E402
+from app.chunk_store import CHUNKS_DIR  # noqa: E402
+from app.embeddings import INDEX_FILE, PRECISIONS, VECTORS_FILE, QuantizedIndex  # noqa: E402
+from app.tools import retrieval_tools  # noqa: E402
+from app.tools.adaptive_k import select_adaptive  # noqa: E402
+from app.tools.registry import TOOL_REGISTRY  # noqa: E402
+from benchmarks.evidence_compression import load_snapshot  # noqa: E402
+from benchmarks.stubs import HashEmbeddings, patched  # noqa: E402
+
+# Snapshot source -> (collection, tool), as configured in scripts/ingest_all.py
+SOURCES = {
+    "kubernetes": ("k8s", "search_kubernetes_docs"),
+    "postmortems": ("incidents", "search_incident_reports"),
+    "gdpr": ("policy", "search_policy_docs"),
+    "stackoverflow": ("stackoverflow", "search_stackoverflow"),
+}
+
+# Metrics compared against a baseline; latency is reported, not gated
+QUALITY_METRICS = ("recall@1", "recall@3", f"recall@{RETRIEVAL_BASE_K}", "mrr")
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _disk_bytes(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def _footprint(directory: Path) -> dict:
+    """On-disk bytes of a version directory, per part."""
+    parts = {"chroma": 0, "quantized_index": 0, "rescore_vectors": 0, "chunk_store": 0}
+    quantized = INDEX_FILE.format(precision="*")
+
+    for path in directory.iterdir():
+        size = _disk_bytes(path) if path.is_dir() else path.stat().st_size
+        if path.name == CHUNKS_DIR:
+            parts["chunk_store"] += size
+        elif path.name == VECTORS_FILE:
+            parts["rescore_vectors"] += size
+        elif path.match(quantized):
+            parts["quantized_index"] += size
+        else:
+            # chroma.sqlite3 and the HNSW segment directories
+            parts["chroma"] += size
+    return parts
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process (Linux KiB units), if known."""
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _reset_handles(embedder):
+    """Make the tools' store handles reopen under the current root."""
+    for handle in vars(retrieval_tools).values():
+        if isinstance(handle, stores.VersionedStore):
+            handle.embedding_function = embedder
+            handle._version = None
+
+
+def source_documents(snapshot: dict) -> dict:
+    """Reassemble snapshot chunks into one text per (source, url)."""
+    texts = defaultdict(list)
+    for row in sorted(snapshot["documents"], key=lambda r: (r["url"], r["chunk_id"])):
+        texts[(row["source_name"], row["source_type"], row["url"])].append(row["text"])
+
+    by_source = defaultdict(dict)
+    for (source_name, source_type, url), parts in texts.items():
+        by_source[(source_name, source_type)][url] = "\n\n".join(parts)
+    return by_source
+
+
+def build_collections(snapshot: dict, embedder, precision: str) -> dict:
+    """
+    Chunk, embed and publish every snapshot source.
+
+    Uses `load_documents` and `build_collection` unchanged, with the
+    fetch step reading from the snapshot instead of the network (and
+    restored afterwards). The caller sets the vector store root and
+    ingestion embedder.
+
+    Returns:
+        dict: Build seconds, chunk count, resident index memory and the
+        on-disk footprint (total and per part)
+    """
+    report = {
+        "build_s": 0.0,
+        "chunks": 0,
+        "index_disk_bytes": 0,
+        "index_memory_bytes": 0,
+        "disk_bytes": defaultdict(int),
+    }
+
+    for (source_name, source_type), pages in source_documents(snapshot).items():
+        collection, _ = SOURCES[source_name]
+        with patched((ingestion, "fetch_text", pages.get)):
+            documents = ingestion.load_documents(list(pages), source_type, source_name)
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ingestion.build_collection(collection, documents)
+        report["build_s"] += time.perf_counter() - started
+        report["chunks"] += len(documents)
+
+        directory = stores.current_dir(collection)
+        for part, size in _footprint(directory).items():
+            report["disk_bytes"][part] += size
+        report["index_disk_bytes"] += _disk_bytes(directory)
+
+        if precision == "float32":
+            # Vectors held by the HNSW graph (links not counted)
+            dims = len(embedder.embed_query("dimension probe"))
+            report["index_memory_bytes"] += 4 * dims * len(documents)
+        else:
+            # Re-scoring vectors are memory-mapped, not resident
+            report["index_memory_bytes"] += QuantizedIndex.load(
+                str(directory), precision
+            ).nbytes
+
+    report["build_s"] = round(report["build_s"], 3)
+    report["disk_bytes"] = dict(report["disk_bytes"])
+    return report
+
+
+def evaluate(snapshot: dict, embedder, k_values) -> dict:
+    """
+    Run every labelled question through the tool of its source.
+
+    Returns:
+        dict: Per-tool and overall quality and latency metrics
+    """
+    by_id = {row["id"]: row for row in snapshot["documents"]}
+    samples = defaultdict(lambda: {"latencies": [], "mrr": [], "hits": [],
+                                   **{f"recall@{k}": [] for k in k_values}})
+
+    for case in snapshot["questions"]:
+        facts = [fact.lower() for fact in case["facts"]]
+        tools = {SOURCES[by_id[rid]["source_name"]][1] for rid in case["relevant"]}
+        vector = embedder.embed_query(case["question"])
+
+        for tool_name in sorted(tools):
+            func = TOOL_REGISTRY[tool_name]["func"]
+
+            started = time.perf_counter()
+            docs = func(case["question"], embedding=vector)
+            elapsed = time.perf_counter() - started
+
+            texts = [doc.page_content.lower() for doc in docs]
+            ranks = [i for i, text in enumerate(texts) if any(f in text for f in facts)]
+
+            for name in (tool_name, "overall"):
+                entry = samples[name]
+                entry["latencies"].append(elapsed)
+                entry["hits"].append(len(docs))
+                entry["mrr"].append(1 / (ranks[0] + 1) if ranks else 0.0)
+                for k in k_values:
+                    top = " ".join(texts[:k])
+                    entry[f"recall@{k}"].append(sum(f in top for f in facts) / len(facts))
+
+    metrics = {}
+    for name, entry in samples.items():
+        metrics[name] = {
+            "queries": len(entry["latencies"]),
+            **{f"recall@{k}": round(statistics.mean(entry[f"recall@{k}"]), 4) for k in k_values},
+            "mrr": round(statistics.mean(entry["mrr"]), 4),
+            "hits_mean": round(statistics.mean(entry["hits"]), 2),
+            "latency_ms_p50": round(1000 * _percentile(entry["latencies"], 0.50), 3),
+            "latency_ms_p95": round(1000 * _percentile(entry["latencies"], 0.95), 3),
+        }
+    return metrics
+
+
+def run(
+    backends=PRECISIONS,
+    chunk_size: int = 900,
+    chunk_overlap: int = 150,
+    dimensions: int = 512,
+    score_floor: float = 0.0,
+    repeat: int = 5,
+    snapshot: dict | None = None
+) -> dict:
+    """
+    Build and evaluate every backend in a temporary vector store root.
+
+    Args:
+        backends: Embedding precisions to evaluate
+        chunk_size (int): Splitter chunk size
+        chunk_overlap (int): Splitter chunk overlap
+        dimensions (int): Stand-in embedder dimension count
+        score_floor (float): Adaptive-k score floor used by the tools
+        repeat (int): Passes over the query set (latency samples)
+        snapshot (dict | None): Snapshot to use instead of the bundled one
+
+    Returns:
+        dict: Settings and per-backend results
+    """
+    snapshot = snapshot or load_snapshot()
+    embedder = HashEmbeddings(size=dimensions)
+    k_values = sorted({1, 3, RETRIEVAL_BASE_K})
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    results = []
+
+    with patched(
+        (ingestion, "splitter", splitter),
+        (ingestion, "embeddings", embedder),
+        (retrieval_tools, "emb", embedder),
+        (retrieval_tools, "select_adaptive",
+         functools.partial(select_adaptive, floor=score_floor)),
+    ):
+        for precision in backends:
+            with tempfile.TemporaryDirectory() as root, patched(
+                (stores, "VECTORSTORE_DIR", root),
+                (ingestion, "EMBEDDING_PRECISION", precision),
+                (retrieval_tools, "EMBEDDING_PRECISION", precision),
+            ):
+                build = build_collections(snapshot, embedder, precision)
+                _reset_handles(embedder)
+
+                evaluate(snapshot, embedder, k_values)  # warm-up pass
+                passes = [evaluate(snapshot, embedder, k_values) for _ in range(repeat)]
+
+                # Quality is deterministic; latency percentiles are the
+                # median over passes
+                metrics = passes[-1]
+                for name, entry in metrics.items():
+                    for q in ("p50", "p95"):
+                        entry[f"latency_ms_{q}"] = round(
+                            statistics.median(p[name][f"latency_ms_{q}"] for p in passes), 3
+                        )
+
+                results.append({"backend": precision, **build, "metrics": metrics})
+
+    _reset_handles(retrieval_tools.emb)
+
+    return {
+        "commit": _commit(),
+        "settings": {
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "embedder": f"HashEmbeddings({dimensions})",
+            "score_floor": score_floor,
+            "questions": len(snapshot["questions"]),
+            "repeat": repeat,
+        },
+        "peak_rss_mb": _peak_rss_mb(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """
+    List quality metrics that dropped more than `tolerance` vs a baseline.
+
+    Returns:
+        list[str]: Human-readable regressions (empty when none)
+    """
+    previous = {row["backend"]: row["metrics"] for row in baseline["results"]}
+    regressions = []
+
+    for row in current["results"]:
+        for name, entry in row["metrics"].items():
+            old = previous.get(row["backend"], {}).get(name)
+            if old is None:
+                continue
+            for metric in QUALITY_METRICS:
+                if metric in old and entry[metric] < old[metric] - tolerance:
+                    regressions.append(
+                        f"{row['backend']}/{name} {metric}: {old[metric]} -> {entry[metric]}"
+                    )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunk-size", type=int, default=900)
+    parser.add_argument("--chunk-overlap", type=int, default=150)
+    parser.add_argument("--backends", default=",".join(PRECISIONS))
+    parser.add_argument("--dimensions", type=int, default=512)
+    parser.add_argument("--score-floor", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.02)
+    args = parser.parse_args()
+
+    report = run(
+        backends=args.backends.split(","),
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        dimensions=args.dimensions,
+        score_floor=args.score_floor,
+        repeat=args.repeat,
+    )
+
+    print(f"{report['settings']['questions']} questions, commit {report['commit']}")
+    for row in report["results"]:
+        overall = row["metrics"]["overall"]
+        print(
+            f"{row['backend']:>8}: chunks={row['chunks']} build={row['build_s']:.2f}s "
+            f"index={row['index_memory_bytes'] / 1024:.0f}KiB "
+            f"disk={row['index_disk_bytes'] / 1024:.0f}KiB "
+            f"(chroma={row['disk_bytes']['chroma'] / 1024:.0f}KiB) "
+            f"recall@{RETRIEVAL_BASE_K}={overall[f'recall@{RETRIEVAL_BASE_K}']:.3f} "
+            f"mrr={overall['mrr']:.3f} "
+            f"p50={overall['latency_ms_p50']:.2f}ms p95={overall['latency_ms_p95']:.2f}ms"
+        )
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
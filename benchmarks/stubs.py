@@ -0,0 +1,176 @@
+"""
+Stub providers for offline benchmarks and tests.
+
+These stand in for `ChatOpenAI` and `OpenAIEmbeddings` so that
+scheduling, hedging, evaluation and retrieval flows can be measured
+without network access or API spend.
+"""
+
+import contextlib
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+
+from langchain_core.embeddings import Embeddings
+
+
+@contextlib.contextmanager
+def patched(*patches):
+    """Temporarily set (object, attribute, value) triples."""
+    saved = [(target, name, getattr(target, name)) for target, name, _ in patches]
+    for target, name, value in patches:
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for target, name, value in reversed(saved):
+            setattr(target, name, value)
+
+
+class StubResponse:
+    """Minimal stand-in for a LangChain `AIMessage`."""
+
+    def __init__(self, content: str, usage_metadata: dict | None = None):
+        self.content = content
+        self.usage_metadata = usage_metadata
+
+
+class StubLLM:
+    """
+    Simulated chat model with configurable latency and failure injection.
+
+    Args:
+        latency (float): Base service time in seconds
+        reply (str | Callable[[str], str]): Response text, or a function
+            of the prompt
+        jitter (float): Uniform extra latency in seconds
+        slow_rate (float): Fraction of calls that take `slow_latency`
+        slow_latency (float): Service time of an injected slow call
+        malformed_rate (float): Fraction of calls returning broken JSON
+        seed (int): Seed for the injection generator
+        per_token (float): Extra seconds per prompt token (~4 characters),
+            modelling prompt processing time
+        connect_latency (float): One-time cost of the first call (TLS
+            handshake / connection setup) unless `connect()` ran first
+        max_retries (int): Timed-out requests retried before giving up
+
+    `invoke` honours a `timeout` keyword the way the OpenAI client does:
+    a request slower than the timeout is abandoned when it expires and
+    re-sent up to `max_retries` times (each one counted in `calls`),
+    then TimeoutError is raised.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.01,
+        reply="ok",
+        jitter: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 1.0,
+        malformed_rate: float = 0.0,
+        seed: int = 0,
+        per_token: float = 0.0,
+        connect_latency: float = 0.0,
+        max_retries: int = 0
+    ):
+        self.latency = latency
+        self.reply = reply
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.malformed_rate = malformed_rate
+        self.per_token = per_token
+        self.connect_latency = connect_latency
+        self.max_retries = max_retries
+        self.connected = False
+        self.model_name = "stub"
+        self.calls = 0
+        self.prompt_chars = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            if self._rng.random() < self.slow_rate:
+                delay = self.slow_latency
+            else:
+                delay = self.latency + self._rng.uniform(0, self.jitter)
+            return delay, self._rng.random() < self.malformed_rate
+
+    def connect(self):
+        """Pay the connection setup cost now instead of on the first call."""
+        with self._lock:
+            if self.connected:
+                return
+            self.connected = True
+        time.sleep(self.connect_latency)
+
+    def invoke(self, prompt, timeout=None, **kwargs):
+        self.connect()
+        delay, malformed = self._draw()
+        with self._lock:
+            self.prompt_chars += len(str(prompt))
+        delay += self.per_token * len(str(prompt)) / 4
+
+        # Like the OpenAI client, abandon a request once the timeout
+        # expires and send a fresh one while retries are left
+        retries = self.max_retries
+        while timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            if not retries:
+                raise TimeoutError("request timed out")
+            retries -= 1
+            delay, malformed = self._draw()
+            delay += self.per_token * len(str(prompt)) / 4
+        time.sleep(delay)
+        text = self.reply(prompt) if callable(self.reply) else self.reply
+        if malformed:
+            text = text[: len(text) // 2]
+        return StubResponse(text)
+
+
+class HashEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embedder for offline retrieval runs.
+
+    Word unigrams and bigrams are hashed into `size` signed buckets with
+    sublinear term frequency and the vector is L2-normalized, so cosine
+    similarity tracks lexical overlap. Output depends only on the text,
+    making results comparable across machines and commits.
+
+    Args:
+        size (int): Vector dimension count
+    """
+
+    _TOKEN = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, size: int = 512):
+        self.size = size
+
+    def _bucket(self, feature: str):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.size, 1.0 if value >> 63 else -1.0
+
+    def _embed(self, text: str) -> list:
+        tokens = self._TOKEN.findall(text.lower())
+        features = Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+
+        vector = [0.0] * self.size
+        for feature, count in features.items():
+            index, sign = self._bucket(feature)
+            vector[index] += sign * (1.0 + math.log(count))
+
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: list) -> list:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list:
+        return self._embed(text)
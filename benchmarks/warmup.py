@@ -0,0 +1,198 @@
+"""
+Cold versus warm start benchmark.
+
+Builds the snapshot collections once (`benchmarks/data/snapshot.json`,
+deterministic `HashEmbeddings`), then starts fresh serving processes
+that answer a series of questions through `run_agent` against stub
+models with a one-time connection cost. Half of the processes run
+`app.warmup.warm_up()` and wait for readiness first, the others take
+traffic cold. Each process pays the real costs of opening Chroma,
+paging indexes, initialising the tokenizer and reading prompts.
+
+Reports, over all trials:
+- first-request latency p50 / p99, cold versus warm
+- steady-state latency p50 of the following requests
+- warm-up duration and whether the process was ready before the
+  first request
+
+Usage:
+    python -m benchmarks.warmup [--trials 5] [--requests 5] [--connect-latency 0.3] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+MODES = ("cold", "warm")
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build(root: str, dimensions: int):
+    """Build every snapshot collection under `root`."""
+    from app import ingestion, stores
+    from benchmarks.evidence_compression import load_snapshot
+    from benchmarks.retrieval import build_collections
+    from benchmarks.stubs import HashEmbeddings, patched
+
+    embedder = HashEmbeddings(size=dimensions)
+    with patched(
+        (stores, "VECTORSTORE_DIR", root),
+        (ingestion, "embeddings", embedder),
+    ):
+        build_collections(load_snapshot(), embedder, "float32")
+
+
+def serve(mode: str, root: str, args) -> dict:
+    """
+    Answer `args.requests` questions in this (fresh) process.
+
+    Runs in a child process so every trial starts cold.
+    """
+    started = time.perf_counter()
+
+    from app import stores, warmup
+    from app.agent import agent_loop
+    from app.llms import llm_fast, llm_reasoning
+    from app.tools import retrieval_tools
+    from app.tools.registry import TOOL_REGISTRY
+    from benchmarks.evaluation import ScenarioReplies
+    from benchmarks.evidence_compression import load_snapshot
+    from benchmarks.stubs import HashEmbeddings, StubLLM
+
+    stores.VECTORSTORE_DIR = root
+    embedder = HashEmbeddings(size=args.dimensions)
+    retrieval_tools.emb = embedder
+    for handle in retrieval_tools.STORE_HANDLES:
+        handle.embedding_function = embedder
+
+    questions = [case["question"] for case in load_snapshot()["questions"]]
+    replies = ScenarioReplies(questions, 0.0, 0.0, seed=0)
+
+    def reply(prompt: str) -> str:
+        text = replies(prompt)
+        if prompt.startswith("You are an Agent Planner"):
+            plan = json.loads(text)
+            plan["tools"] = list(TOOL_REGISTRY)
+            text = json.dumps(plan)
+        return text
+
+    llm_fast.llm = StubLLM(
+        latency=args.latency, reply=reply, connect_latency=args.connect_latency
+    )
+    llm_reasoning.llm = StubLLM(
+        latency=4 * args.latency, reply=reply, connect_latency=args.connect_latency
+    )
+    imported_s = time.perf_counter() - started
+
+    warmup_s = None
+    if mode == "warm":
+        begin = time.perf_counter()
+        warmup.warm_up(clients=(llm_fast.llm, llm_reasoning.llm))
+        warmup_s = time.perf_counter() - begin
+    ready = warmup.is_ready()
+
+    latencies = []
+    for question in questions[:args.requests]:
+        begin = time.perf_counter()
+        agent_loop.run_agent(question)
+        latencies.append(time.perf_counter() - begin)
+
+    return {
+        "mode": mode,
+        "import_s": round(imported_s, 3),
+        "warmup_s": round(warmup_s, 3) if warmup_s is not None else None,
+        "warmup_errors": warmup.REPORT.get("errors", {}),
+        "ready_before_first_request": ready,
+        "latencies_s": [round(x, 4) for x in latencies],
+    }
+
+
+def summarize(runs: list) -> list:
+    """Aggregate child results per mode."""
+    results = []
+    for mode in MODES:
+        rows = [r for r in runs if r["mode"] == mode]
+        first = [r["latencies_s"][0] for r in rows]
+        rest = [x for r in rows for x in r["latencies_s"][1:]]
+        warmups = [r["warmup_s"] for r in rows if r["warmup_s"] is not None]
+
+        results.append({
+            "mode": mode,
+            "trials": len(rows),
+            "first_request_ms_p50": round(1000 * _percentile(first, 0.50), 1),
+            "first_request_ms_p99": round(1000 * _percentile(first, 0.99), 1),
+            "steady_ms_p50": round(1000 * _percentile(rest, 0.50), 1) if rest else None,
+            "warmup_s_mean": round(sum(warmups) / len(warmups), 3) if warmups else None,
+            "ready_before_first_request": all(r["ready_before_first_request"] for r in rows),
+            "warmup_errors": sorted({k for r in rows for k in r["warmup_errors"]}),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--connect-latency", type=float, default=0.3)
+    parser.add_argument("--dimensions", type=int, default=512)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Keep stdout for the JSON result only
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        result = serve(args.child, args.root, args)
+        sys.stdout = stdout
+        print(json.dumps(result))
+        return
+
+    runs = []
+    with tempfile.TemporaryDirectory() as root:
+        build(root, args.dimensions)
+
+        for _ in range(args.trials):
+            for mode in MODES:
+                child = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.warmup", "--child", mode,
+                     "--root", root,
+                     "--requests", str(args.requests),
+                     "--latency", str(args.latency),
+                     "--connect-latency", str(args.connect_latency),
+                     "--dimensions", str(args.dimensions)],
+                    capture_output=True, text=True, check=True
+                )
+                runs.append(json.loads(child.stdout.strip().splitlines()[-1]))
+
+    results = summarize(runs)
+    for row in results:
+        warmup_s = f"{row['warmup_s_mean']:.2f}s" if row["warmup_s_mean"] is not None else "-"
+        print(
+            f"{row['mode']:>5}: first p50={row['first_request_ms_p50']:.0f}ms "
+            f"p99={row['first_request_ms_p99']:.0f}ms "
+            f"steady p50={row['steady_ms_p50']:.0f}ms "
+            f"warm-up={warmup_s} ready={row['ready_before_first_request']}"
+        )
+
+    payload = json.dumps({"results": results, "runs": runs}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,39 +5,123 @@ Run this whenever you:
 - Add new URLs
 - Update documentation sources
 - Refresh embeddings
+
+All sources are fetched concurrently, then passed through one shared
+near-duplicate index: duplicates within a collection are dropped, and
+boilerplate repeated across sources is embedded only once. Text shared
+by just a few sources stays in each of them, so every search tool still
+finds it. Each collection is then embedded in its own process into a
+new version directory, validated, and published by atomically switching
+its CURRENT pointer; running servers pick up the new version without a
+restart and keep serving the old one if a build fails.
 """
 
-from app.ingestion import build_vectorstore
+import sys
+import time
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+
+from app.dedup import MinHashDeduplicator
+from app.ingestion import build_collection, load_documents
 from app.utils import load_urls
 
-print("Starting ingestion...")
+SOURCES = [
+    {
+        "urls": "data/urls_k8s.txt",
+        "collection": "k8s",
+        "source_type": "techdoc",
+        "source_name": "kubernetes",
+    },
+    {
+        "urls": "data/urls_incidents.txt",
+        "collection": "incidents",
+        "source_type": "incident",
+        "source_name": "postmortems",
+    },
+    {
+        "urls": "data/urls_policy.txt",
+        "collection": "policy",
+        "source_type": "policy",
+        "source_name": "gdpr",
+    },
+    {
+        "urls": "data/urls_stackoverflow.txt",
+        "collection": "stackoverflow",
+        "source_type": "stackoverflow",
+        "source_name": "stackoverflow",
+    },
+]
 
-build_vectorstore(
-    urls=load_urls("data/urls_k8s.txt"),
-    collection="k8s",
-    source_type="techdoc",
-    source_name="kubernetes"
-)
 
-build_vectorstore(
-    urls=load_urls("data/urls_incidents.txt"),
-    collection="incidents",
-    source_type="incident",
-    source_name="postmortems"
-)
+def load_source(source: dict):
+    """Fetch and chunk one source (I/O bound; runs in a thread)."""
+    started = time.perf_counter()
+    documents = load_documents(
+        urls=load_urls(source["urls"]),
+        source_type=source["source_type"],
+        source_name=source["source_name"]
+    )
+    return documents, time.perf_counter() - started
 
-build_vectorstore(
-    urls=load_urls("data/urls_policy.txt"),
-    collection="policy",
-    source_type="policy",
-    source_name="gdpr"
-)
 
-build_vectorstore(
-    urls=load_urls("data/urls_stackoverflow.txt"),
-    collection="stackoverflow",
-    source_type="stackoverflow",
-    source_name="stackoverflow"
-)
+def main():
+    print("Starting ingestion...")
+    started = time.perf_counter()
+
+    # Fetch all sources concurrently
+    with ThreadPoolExecutor(max_workers=len(SOURCES)) as pool:
+        loaded = list(pool.map(load_source, SOURCES))
+
+    # Dedup sequentially, in source order, through one shared index
+    dedup = MinHashDeduplicator()
+    collections = {}
+
+    for source, (documents, fetch_s) in zip(SOURCES, loaded):
+        before = dedup.duplicates
+        collections[source["collection"]] = dedup.deduplicate(
+            documents, group=source["collection"]
+        )
+
+        print(
+            f"[{source['collection']}] fetched {len(documents)} chunks "
+            f"in {fetch_s:.1f}s, {dedup.duplicates - before} near-duplicates removed"
+        )
+
+    print(dedup.report())
+
+    # Embed, validate and publish each collection in its own process
+    failures = 0
+    with ProcessPoolExecutor(max_workers=len(collections)) as pool:
+        futures = {
+            pool.submit(build_collection, collection, documents): collection
+            for collection, documents in collections.items()
+        }
+
+        for future in as_completed(futures):
+            collection = futures[future]
+            try:
+                report = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"[{collection}] FAILED, live version unchanged: {e}")
+                continue
+
+            print(
+                f"[{collection}] published {report['version']}: "
+                f"{report['chunks']} chunks, built in {report['build_s']}s, "
+                f"validated in {report['validate_s']}s"
+            )
+
+    elapsed = time.perf_counter() - started
+    if failures:
+        print(f"Ingestion finished with {failures} failed collection(s) in {elapsed:.1f}s.")
+        sys.exit(1)
+
+    print(f"Ingestion completed successfully in {elapsed:.1f}s.")
+
 
-print("Ingestion completed successfully.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
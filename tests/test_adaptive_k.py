@@ -0,0 +1,29 @@
+from app.tools.adaptive_k import select_adaptive
+
+
+def _hits(*scores):
+    return [(f"doc{i}", s) for i, s in enumerate(scores)]
+
+
+def test_tool_dropped_when_best_hit_below_floor():
+    assert select_adaptive(_hits(0.2, 0.19, 0.18), floor=0.25) == []
+
+
+def test_stops_at_score_gap():
+    kept = select_adaptive(_hits(0.62, 0.60, 0.45, 0.44), gap=0.08)
+    assert [doc for doc, _ in kept] == ["doc0", "doc1"]
+
+
+def test_stops_at_relative_cutoff():
+    kept = select_adaptive(
+        _hits(0.60, 0.55, 0.50, 0.46, 0.44), relative_cutoff=0.15, gap=0.1
+    )
+    assert len(kept) == 4
+
+
+def test_fetches_deeper_when_scores_are_clustered():
+    clustered = _hits(*[0.50 - 0.002 * i for i in range(12)])
+    spread = _hits(*[0.50 - 0.01 * i for i in range(12)])
+
+    assert len(select_adaptive(clustered, base_k=6, max_k=12)) == 12
+    assert len(select_adaptive(spread, base_k=6, max_k=12)) == 6
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+from langchain_core.documents import Document
+
+from app.agent import agent_loop
+from app.agent import llm_calls
+from app.agent.llm_calls import MalformedResponse
+from app.agent.planner import Plan
+from app.llms import DeadlineExceeded, LLMScheduler, ScheduledLLM
+from app.tools.registry import TOOL_REGISTRY
+from benchmarks.stubs import StubLLM
+
+ANSWER = "RoleBindings grant a Role's permissions [kubernetes|0](https://k8s.example/rbac)."
+
+
+def _fail(error):
+    def call(*args, **kwargs):
+        raise error
+    return call
+
+
+@pytest.fixture
+def offline_agent(monkeypatch):
+    plan = Plan(
+        intent="lookup",
+        subquestions=[],
+        tools=["search_kubernetes_docs"],
+        need_clarification=False,
+        clarification_question=None,
+    )
+    docs = [Document(
+        page_content="A RoleBinding grants the permissions defined in a Role.",
+        metadata={"url": "https://k8s.example/rbac", "chunk_id": 0,
+                  "source_name": "kubernetes", "source_type": "techdoc"},
+    )]
+    monkeypatch.setattr(agent_loop, "create_plan", lambda question, context: plan)
+    monkeypatch.setattr(agent_loop, "retrieve_documents", lambda tools, query: docs)
+    monkeypatch.setattr(agent_loop, "reason", lambda question, evidence, critique=None: ANSWER)
+    return monkeypatch
+
+
+@pytest.mark.parametrize("error", [DeadlineExceeded("late"), MalformedResponse("bad json")])
+def test_failed_critic_and_judge_still_return_the_answer(offline_agent, error):
+    offline_agent.setattr(agent_loop, "EVALUATION_MODE", "separate")
+    offline_agent.setattr(agent_loop, "critique_answer", _fail(error))
+    offline_agent.setattr(agent_loop, "judge_answer", _fail(error))
+
+    answer, trace = agent_loop.run_agent("What does a RoleBinding do?")
+
+    assert answer == ANSWER
+    assert trace["final_state"] == "answered"
+    assert trace["critic"]["needs_revision"] is False
+    assert "critic_revision" not in trace
+    assert trace["judge"]["verdict"] == "unavailable"
+    assert type(error).__name__ in trace["judge"]["error"]
+    assert "auto_retry" not in trace
+
+
+def test_failed_combined_evaluation_skips_revision_and_retry(offline_agent):
+    offline_agent.setattr(agent_loop, "EVALUATION_MODE", "combined")
+    offline_agent.setattr(agent_loop, "evaluate_answer", _fail(DeadlineExceeded("late")))
+    offline_agent.setattr(agent_loop, "judge_answer", _fail(AssertionError("not called")))
+
+    answer, trace = agent_loop.run_agent("What does a RoleBinding do?")
+
+    assert answer == ANSWER
+    assert trace["critic"]["needs_revision"] is False
+    assert trace["judge"] == {"verdict": "unavailable", "error": "DeadlineExceeded: late"}
+    assert "auto_retry" not in trace
+
+
+@pytest.mark.parametrize("error", [DeadlineExceeded("late"), MalformedResponse("bad json")])
+def test_failed_plan_searches_every_tool(offline_agent, error):
+    for name in ("search_kubernetes_docs", "search_policies"):
+        offline_agent.setitem(TOOL_REGISTRY, name, {"description": name})
+    searched = []
+
+    def retrieve(tools, query):
+        searched.extend(tools)
+        return []
+
+    offline_agent.setattr(agent_loop, "create_plan", _fail(error))
+    offline_agent.setattr(agent_loop, "retrieve_documents", retrieve)
+    offline_agent.setattr(agent_loop, "EVALUATION_MODE", "combined")
+    offline_agent.setattr(agent_loop, "evaluate_answer", _fail(error))
+
+    answer, trace = agent_loop.run_agent("What does a RoleBinding do?")
+
+    assert answer == ANSWER
+    assert trace["final_state"] == "answered"
+    assert searched == trace["plan"]["tools"] == list(TOOL_REGISTRY)
+    assert {"search_kubernetes_docs", "search_policies"} <= set(searched)
+    assert type(error).__name__ in trace["plan"]["error"]
+
+
+def test_starved_retry_gives_up_at_its_deadline(offline_agent):
+    # Interactive traffic holds the only slot for the whole test
+    scheduler = LLMScheduler(max_in_flight=1)
+    scheduler.acquire(1)
+    offline_agent.setattr(agent_loop, "llm_fast", ScheduledLLM(StubLLM(latency=0), scheduler))
+    offline_agent.setitem(llm_calls.STAGE_DEADLINES, "retry", 0.1)
+    offline_agent.setattr(agent_loop, "EVALUATION_MODE", "separate")
+    offline_agent.setattr(agent_loop, "critique_answer", lambda **kw: {"needs_revision": False})
+    offline_agent.setattr(agent_loop, "judge_answer", lambda **kw: {
+        "verdict": "needs_review", "score": 0.4, "rationale": "thin"
+    })
+
+    started = time.monotonic()
+    answer, trace = agent_loop.run_agent("What does a RoleBinding do?")
+
+    assert time.monotonic() - started < 1.0
+    assert answer == ANSWER
+    assert trace["auto_retry"] is True
+    assert "DeadlineExceeded" in trace["retry"]["error"]
+    assert trace["judge"]["verdict"] == "needs_review"
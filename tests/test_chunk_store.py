@@ -0,0 +1,65 @@
+from langchain_core.documents import Document
+
+from app.chunk_store import ChunkStore
+
+
+def _docs():
+    texts = ["Pod security admission", "Zäune und Grüße " * 40, ""]
+    return [
+        Document(
+            page_content=text,
+            metadata={
+                "url": f"https://example.com/{i % 2}",
+                "chunk_id": i,
+                "source_name": "kubernetes",
+                "source_type": "techdoc",
+            },
+        )
+        for i, text in enumerate(texts)
+    ]
+
+
+def test_round_trip_and_interned_metadata(tmp_path):
+    docs = _docs()
+    ChunkStore.write(tmp_path, docs)
+    chunks = ChunkStore.open(tmp_path)
+
+    assert len(chunks) == 3
+    for row, doc in enumerate(docs):
+        assert chunks.text(row) == doc.page_content
+        assert chunks.metadata(row) == doc.metadata
+
+    # Repeated values are stored once in the string table
+    # (2 urls, source name, source type, empty duplicate_sources)
+    assert len(chunks.strings) == 5
+
+
+def test_snippet_decodes_only_the_prefix(tmp_path):
+    docs = _docs()
+    ChunkStore.write(tmp_path, docs)
+    chunks = ChunkStore.open(tmp_path)
+
+    ref = chunks.ref(1)
+    assert ref.id == "1"
+    assert ref.snippet(25) == docs[1].page_content[:25]
+    assert ref.page_content == docs[1].page_content
+    assert chunks.snippet(2, 10) == ""
+
+
+def test_duplicate_metadata_survives_the_round_trip(tmp_path):
+    docs = _docs()
+    sources = "[stackoverflow|3](https://so.example/q)\n[gdpr|0](https://gdpr.example)"
+    docs[0].metadata.update(duplicate_count=2, duplicate_sources=sources)
+    docs[2].metadata.update(duplicate_count=1, duplicate_sources=sources)
+
+    ChunkStore.write(tmp_path, docs)
+    chunks = ChunkStore.open(tmp_path)
+
+    assert chunks.ref(0).metadata == docs[0].metadata
+    assert chunks.metadata(1) == docs[1].metadata
+    assert "duplicate_count" not in chunks.metadata(1)
+    assert chunks.strings.count(sources) == 1
+
+
+def test_missing_store_opens_as_none(tmp_path):
+    assert ChunkStore.open(tmp_path) is None
@@ -0,0 +1,33 @@
+from app.tools.compression import compress_evidence
+
+EVIDENCE = (
+    "[kubernetes|1](https://kubernetes.io/docs/rbac/)\n"
+    "A RoleBinding grants the permissions defined in a role. "
+    "It holds a list of subjects. "
+    "You cannot change the roleRef of an existing RoleBinding. "
+    "Remove the binding and create a replacement instead.\n\n"
+    "[gdpr|0](https://gdpr-info.eu/art-33-gdpr/)\n"
+    "A personal data breach must be notified within 72 hours. "
+    "Reasons must accompany a late notification."
+)
+
+
+def test_headers_kept_and_relevant_sentences_selected():
+    compressed, stats = compress_evidence(
+        EVIDENCE, "How do I change the roleRef of a RoleBinding?", ratio=0.4
+    )
+
+    assert "[kubernetes|1](https://kubernetes.io/docs/rbac/)\n" in compressed
+    assert "[gdpr|0](https://gdpr-info.eu/art-33-gdpr/)\n" in compressed
+    assert "cannot change the roleRef" in compressed
+    assert "list of subjects" not in compressed
+
+    assert stats["compressed_chars"] < stats["original_chars"]
+    assert stats["sentences_kept"] < stats["sentences_total"] == 6
+
+
+def test_ratio_one_is_a_no_op():
+    compressed, stats = compress_evidence(EVIDENCE, "anything", ratio=1)
+
+    assert compressed == EVIDENCE
+    assert stats["ratio"] == 1.0
@@ -0,0 +1,73 @@
+from langchain_core.documents import Document
+
+from app.dedup import MinHashDeduplicator
+
+FOOTER = (
+    "Content is available under the Creative Commons Attribution 4.0 "
+    "license. Code samples are licensed under the Apache 2.0 license. "
+    "For details, see the site policies. Last updated 2024-01-01."
+)
+
+
+def _doc(text, url, chunk_id=0, source_name="kubernetes"):
+    return Document(
+        page_content=text,
+        metadata={
+            "url": url,
+            "chunk_id": chunk_id,
+            "source_type": "techdoc",
+            "source_name": source_name,
+        },
+    )
+
+
+def test_dedup_keeps_one_canonical_chunk_and_records_alternates():
+    dedup = MinHashDeduplicator()
+    docs = [
+        _doc(FOOTER, "https://a.example/1"),
+        _doc(FOOTER.replace("2024-01-01", "2024-02-03"), "https://a.example/2"),
+        _doc("Roles grant permissions within a namespace.", "https://a.example/3"),
+    ]
+
+    kept = dedup.deduplicate(docs)
+
+    assert [d.metadata["url"] for d in kept] == [
+        "https://a.example/1",
+        "https://a.example/3",
+    ]
+    assert kept[0].metadata["duplicate_count"] == 1
+    assert "https://a.example/2" in kept[0].metadata["duplicate_sources"]
+    assert dedup.stats()["duplicates"] == 1
+
+
+def test_text_shared_by_two_collections_stays_in_both():
+    dedup = MinHashDeduplicator()
+    answer = "Set securityContext.runAsNonRoot to true to reject root containers. " * 3
+
+    k8s = dedup.deduplicate([_doc(answer, "https://k8s.example/a")], group="k8s")
+    so = dedup.deduplicate(
+        [
+            _doc(answer, "https://so.example/q", source_name="stackoverflow"),
+            _doc(answer, "https://so.example/r", chunk_id=1, source_name="stackoverflow"),
+        ],
+        group="stackoverflow",
+    )
+
+    assert len(k8s) == 1
+    assert [d.metadata["url"] for d in so] == ["https://so.example/q"]
+    # The in-collection duplicate is recorded on the stackoverflow copy
+    assert "[stackoverflow|1]" in so[0].metadata["duplicate_sources"]
+    assert "duplicate_count" not in k8s[0].metadata
+
+
+def test_boilerplate_is_dropped_across_collections():
+    dedup = MinHashDeduplicator(boilerplate_repeats=3)
+
+    kept = [
+        dedup.deduplicate([_doc(FOOTER, f"https://{name}.example/a", source_name=name)], group=name)
+        for name in ("kubernetes", "postmortems", "gdpr")
+    ]
+
+    assert [len(docs) for docs in kept] == [1, 1, 0]
+    assert "[gdpr|0]" in kept[0][0].metadata["duplicate_sources"]
+    assert dedup.ratio == 1 / 3
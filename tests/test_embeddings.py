@@ -0,0 +1,83 @@
+import numpy as np
+
+from app.embeddings import VECTORS_FILE, QuantizedIndex, quantize, rescore, truncate
+
+
+def _vectors(n=200, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    return truncate(rng.normal(size=(n, dim)), dim)
+
+
+def test_quantize_precisions_round_trip_closely():
+    vectors = _vectors()
+
+    data, scales = quantize(vectors, "float16")
+    assert data.dtype == np.float16 and scales is None
+    assert np.abs(data.astype(np.float32) - vectors).max() < 1e-3
+
+    data, scales = quantize(vectors, "int8")
+    assert data.dtype == np.int8 and scales.shape == (len(vectors),)
+    restored = data.astype(np.float32) * scales[:, None]
+    assert np.abs(restored - vectors).max() <= scales.max() / 2 + 1e-6
+
+
+def test_search_returns_exact_neighbour_first():
+    vectors = _vectors()
+    ids = [str(i) for i in range(len(vectors))]
+
+    for precision in ("float32", "float16", "int8"):
+        index = QuantizedIndex.from_vectors(ids, vectors, precision)
+        hits = index.search(vectors[17], k=3)
+
+        assert len(hits) == 3
+        assert hits[0][0] == "17"
+        assert [s for _, s in hits] == sorted((s for _, s in hits), reverse=True)
+
+
+def test_rescore_orders_candidates_by_full_precision_score():
+    vectors = _vectors()
+    query = vectors[5]
+
+    rows, scores = rescore(query, np.array([9, 5, 40]), vectors)
+
+    assert rows[0] == 5
+    assert np.allclose(scores, vectors[rows] @ query)
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_rescoring_search_matches_exact_top_k():
+    vectors = _vectors(n=500)
+    index = QuantizedIndex.from_vectors([str(i) for i in range(500)], vectors, "int8")
+    query = truncate(vectors[3] + vectors[4], vectors.shape[1])
+
+    exact = np.argsort(-(vectors @ query))[:5]
+    hits = index.search(query, k=5, rescore_factor=4)
+
+    assert [int(cid) for cid, _ in hits] == list(exact)
+    assert np.isclose(hits[0][1], float(vectors[exact[0]] @ query))
+
+
+def test_save_load_memory_maps_full_vectors(tmp_path):
+    vectors = _vectors()
+    ids = [str(i) for i in range(len(vectors))]
+    QuantizedIndex.from_vectors(ids, vectors, "int8").save(tmp_path)
+
+    index = QuantizedIndex.load(tmp_path, "int8")
+
+    assert (tmp_path / VECTORS_FILE).exists()
+    assert isinstance(index.vectors, np.memmap)
+    assert len(index) == len(vectors)
+    assert index.search(vectors[8], k=1, rescore_factor=4)[0][0] == "8"
+    assert np.allclose(index.row(8), vectors[8])
+
+
+def test_index_without_full_vectors_skips_rescoring(tmp_path):
+    vectors = _vectors()
+    QuantizedIndex.from_vectors(
+        [str(i) for i in range(len(vectors))], vectors, "float16", keep_full=False
+    ).save(tmp_path)
+
+    index = QuantizedIndex.load(tmp_path, "float16")
+
+    assert index.vectors is None
+    assert index.search(vectors[2], k=1, rescore_factor=4)[0][0] == "2"
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from app.agent import llm_calls
+from app.agent.evaluator import Evaluation, evaluate_answer
+from app.llms import llm_fast
+from benchmarks.stubs import StubLLM
+
+REPLY = {
+    "needs_revision": True,
+    "critic_rationale": "The answer skips the roleRef restriction.",
+    "score": 0.55,
+    "grounded": True,
+    "relevant": True,
+    "well_cited": False,
+    "confidence": "medium",
+    "verdict": "needs_review",
+    "rationale": "Missing citation URLs.",
+}
+
+
+def test_one_call_yields_critic_and_judge_results(monkeypatch):
+    stub = StubLLM(latency=0, reply=json.dumps(REPLY))
+    monkeypatch.setattr(llm_fast, "llm", stub)
+
+    evaluation = evaluate_answer("How do I change a roleRef?", "Edit it.", "[k8s|1](u)\n...")
+
+    assert stub.calls == 1
+    assert evaluation.critic() == {
+        "needs_revision": True,
+        "rationale": "The answer skips the roleRef restriction.",
+    }
+    judge = evaluation.judge()
+    assert judge["verdict"] == "needs_review"
+    assert judge["score"] == 0.55
+    assert "needs_revision" not in judge
+
+
+def test_incomplete_reply_is_rejected(monkeypatch):
+    partial = {k: v for k, v in REPLY.items() if k != "verdict"}
+    monkeypatch.setattr(llm_fast, "llm", StubLLM(latency=0, reply=json.dumps(partial)))
+
+    with pytest.raises(llm_calls.MalformedResponse):
+        evaluate_answer("q", "a", "e")
+
+    with pytest.raises(ValueError):
+        Evaluation(**partial)
+
+
+@pytest.mark.parametrize("field, value", [
+    ("verdict", "approved"),
+    ("confidence", "very high"),
+    ("score", 7),
+])
+def test_out_of_schema_reply_is_rejected(monkeypatch, field, value):
+    reply = {**REPLY, field: value}
+    stub = StubLLM(latency=0, reply=json.dumps(reply))
+    monkeypatch.setattr(llm_fast, "llm", stub)
+
+    with pytest.raises(llm_calls.MalformedResponse):
+        evaluate_answer("q", "a", "e")
+    # The bad reply went through the malformed-reply retry
+    assert stub.calls > 1
@@ -0,0 +1,28 @@
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app import ingestion, stores
+from app.stores import VersionedStore
+
+
+def test_chroma_holds_only_ids_and_vectors(tmp_path, monkeypatch):
+    monkeypatch.setattr(stores, "VECTORSTORE_DIR", str(tmp_path))
+    monkeypatch.setattr(ingestion, "embeddings", DeterministicFakeEmbedding(size=16))
+    monkeypatch.setattr(ingestion, "EMBEDDING_PRECISION", "float32")
+    docs = [
+        Document(page_content=text, metadata={"url": "https://k8s.example", "chunk_id": i})
+        for i, text in enumerate(["rbac roles", "pod security", "network policy"])
+    ]
+
+    report = ingestion.build_collection("k8s", docs)
+
+    version = VersionedStore("k8s", ingestion.embeddings).current()
+    rows = version.store.get(include=["documents", "metadatas", "embeddings"])
+    assert report["chunks"] == 3
+    assert rows["ids"] == ["0", "1", "2"]
+    assert rows["documents"] == [None] * 3
+    assert rows["metadatas"] == [None] * 3
+    assert len(rows["embeddings"]) == 3
+    # Text and metadata are served from the chunk store
+    assert version.chunks.ref(1).page_content == "pod security"
+    assert version.chunks.metadata(1)["chunk_id"] == 1
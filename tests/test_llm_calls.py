@@ -0,0 +1,138 @@
+import itertools
+import json
+import threading
+import time
+
+import httpx
+import openai
+import pytest
+
+from app.agent import llm_calls
+from app.llms import DeadlineExceeded, LLMScheduler, ScheduledLLM
+from benchmarks.stubs import StubLLM, StubResponse
+
+REPLY = json.dumps({"verdict": "approve", "score": 0.9})
+
+
+class ScriptedLLM:
+    """Stub whose n-th call uses the n-th (latency, reply) pair.
+
+    A reply that is an exception is raised instead of returned.
+    """
+
+    def __init__(self, script):
+        self._script = iter(script)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs):
+        with self._lock:
+            self.calls += 1
+            latency, reply = next(self._script)
+        time.sleep(latency)
+        if isinstance(reply, Exception):
+            raise reply
+        return StubResponse(reply)
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    llm_calls.reset_call_stats()
+    yield
+    llm_calls.reset_call_stats()
+
+
+def _warm(stage, latency=0.01):
+    stats = llm_calls._stage_stats(stage)
+    stats.latencies.extend([latency] * llm_calls.MIN_HEDGE_SAMPLES)
+
+
+def test_hedge_wins_when_first_attempt_is_slow():
+    _warm("judge")
+    llm = ScriptedLLM([(1.0, REPLY), (0.01, REPLY)])
+
+    result = llm_calls.invoke_json("prompt", stage="judge", llm=llm)
+
+    stats = llm_calls.call_stats()["judge"]
+    assert result["verdict"] == "approve"
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def _connection_error():
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.example"))
+
+
+def test_provider_error_waits_for_the_hedged_attempt():
+    _warm("judge")
+    llm = ScriptedLLM([(0.05, _connection_error()), (0.1, REPLY)])
+
+    result = llm_calls.invoke_json("prompt", stage="judge", llm=llm)
+
+    stats = llm_calls.call_stats()["judge"]
+    assert result["verdict"] == "approve"
+    assert stats["errors"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_provider_error_is_raised_when_nothing_is_pending():
+    llm = ScriptedLLM([(0.0, _connection_error())])
+
+    with pytest.raises(openai.APIConnectionError):
+        llm_calls.invoke_json("prompt", stage="critic", llm=llm)
+
+
+def test_malformed_reply_is_retried():
+    llm = ScriptedLLM([(0.0, "{not json"), (0.0, "```json\n" + REPLY + "\n```")])
+
+    result = llm_calls.invoke_json("prompt", stage="critic", llm=llm)
+
+    assert result["score"] == 0.9
+    assert llm_calls.call_stats()["critic"]["malformed"] == 1
+
+
+def test_malformed_retries_are_bounded():
+    llm = ScriptedLLM(itertools.repeat((0.0, "nope")))
+
+    with pytest.raises(llm_calls.MalformedResponse):
+        llm_calls.invoke_json("prompt", stage="planner", llm=llm)
+
+    assert llm.calls == llm_calls.MAX_MALFORMED_RETRIES + 1
+
+
+def test_deadline_bounds_slow_calls(monkeypatch):
+    monkeypatch.setitem(llm_calls.STAGE_DEADLINES, "judge", 0.05)
+    llm = ScriptedLLM([(0.5, REPLY)])
+
+    with pytest.raises(DeadlineExceeded):
+        llm_calls.invoke_json("prompt", stage="judge", llm=llm, hedge=False)
+
+
+def test_abandoned_attempt_frees_its_slot_at_the_deadline(monkeypatch):
+    llm = ScheduledLLM(StubLLM(latency=1.0), LLMScheduler(max_in_flight=1))
+    monkeypatch.setitem(llm_calls.STAGE_DEADLINES, "judge", 0.2)
+
+    with pytest.raises(DeadlineExceeded):
+        llm_calls.invoke_json("judge this", stage="judge", llm=llm)
+
+    # The provider call was cut off by its request timeout
+    time.sleep(0.1)
+    assert llm.scheduler.metrics()["in_flight"] == 0
+
+    llm.llm.latency = 0.0
+    llm.llm.reply = REPLY
+    assert llm_calls.invoke_json("judge this", stage="judge", llm=llm)["verdict"] == "approve"
+
+
+def test_client_retries_share_the_deadline():
+    stub = StubLLM(latency=1.0, max_retries=2)
+    llm = ScheduledLLM(stub, LLMScheduler(max_in_flight=1))
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        llm.invoke("judge this", deadline=started + 0.3)
+
+    # Three attempts were sent, yet the slot was held only until the deadline
+    assert stub.calls == 3
+    assert time.monotonic() - started < 0.45
+    assert llm.scheduler.metrics()["in_flight"] == 0
@@ -0,0 +1,41 @@
+from app import ingestion, stores
+from benchmarks import retrieval
+from benchmarks.evidence_compression import load_snapshot
+from benchmarks.stubs import HashEmbeddings
+from app.config import RETRIEVAL_BASE_K
+
+RECALL = f"recall@{RETRIEVAL_BASE_K}"
+
+
+def test_snapshot_retrieval_quality_per_backend():
+    report = retrieval.run(backends=("float32", "int8"), repeat=1)
+    float32, int8 = (row["metrics"]["overall"] for row in report["results"])
+
+    assert float32["queries"] == 13
+    assert float32[RECALL] >= 0.9
+    assert float32["mrr"] >= 0.75
+    # Quantization may not cost ranking quality on this corpus
+    assert int8["mrr"] >= float32["mrr"] - 0.05
+
+    # Identical runs never report a regression; a drop beyond tolerance does
+    assert retrieval.compare(report, report, tolerance=0.0) == []
+    worse = {"results": [
+        {**row, "metrics": {"overall": {**row["metrics"]["overall"], "mrr": 0.0}}}
+        for row in report["results"]
+    ]}
+    assert retrieval.compare(worse, report, tolerance=0.02) == [
+        f"{row['backend']}/overall mrr: {row['metrics']['overall']['mrr']} -> 0.0"
+        for row in report["results"]
+    ]
+
+
+def test_build_collections_restores_the_fetch_step(tmp_path, monkeypatch):
+    embedder = HashEmbeddings(size=64)
+    monkeypatch.setattr(stores, "VECTORSTORE_DIR", str(tmp_path))
+    monkeypatch.setattr(ingestion, "embeddings", embedder)
+    fetch_text = ingestion.fetch_text
+
+    report = retrieval.build_collections(load_snapshot(), embedder, "float32")
+
+    assert report["chunks"] > 0
+    assert ingestion.fetch_text is fetch_text
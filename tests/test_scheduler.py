@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from app.llms import DeadlineExceeded, LLMScheduler, Priority, ScheduledLLM
+from benchmarks.stubs import StubLLM
+
+SERVICE_TIME = 0.02
+
+
+def _p95(samples):
+    ordered = sorted(samples)
+    return ordered[int(0.95 * (len(ordered) - 1))]
+
+
+def _interactive_latencies(llm, n=30):
+    latencies = []
+    for _ in range(n):
+        start = time.monotonic()
+        llm.invoke("interactive question", priority=Priority.INTERACTIVE)
+        latencies.append(time.monotonic() - start)
+        time.sleep(SERVICE_TIME / 2)
+    return latencies
+
+
+def test_interactive_p95_holds_while_batch_job_runs():
+    llm = ScheduledLLM(
+        StubLLM(latency=SERVICE_TIME),
+        LLMScheduler(max_in_flight=2, tokens_per_minute=10_000_000)
+    )
+
+    baseline = _p95(_interactive_latencies(llm))
+
+    stop = threading.Event()
+
+    def batch_worker():
+        while not stop.is_set():
+            llm.invoke("batch question", priority=Priority.BATCH)
+
+    workers = [threading.Thread(target=batch_worker) for _ in range(8)]
+    for w in workers:
+        w.start()
+
+    try:
+        time.sleep(0.1)
+        under_load = _p95(_interactive_latencies(llm))
+        metrics = llm.scheduler.metrics()
+    finally:
+        stop.set()
+        for w in workers:
+            w.join()
+
+    # At worst an interactive call waits for one in-flight batch call
+    assert under_load <= baseline + 2 * SERVICE_TIME
+    assert metrics["queue_depth_by_priority"]["batch"] > 0
+    assert metrics["priorities"]["batch"]["admitted"] > 0
+
+
+def test_expired_deadline_is_rejected_without_calling_provider():
+    stub = StubLLM(latency=SERVICE_TIME)
+    llm = ScheduledLLM(stub, LLMScheduler(max_in_flight=1))
+
+    with pytest.raises(DeadlineExceeded):
+        llm.invoke("late", deadline=time.monotonic() - 1)
+
+    assert stub.calls == 0
+    assert llm.scheduler.metrics()["priorities"]["interactive"]["rejected"] == 1
+
+
+def test_queued_call_gives_up_when_deadline_passes():
+    scheduler = LLMScheduler(max_in_flight=1)
+    reserved = scheduler.acquire(10)
+
+    with pytest.raises(DeadlineExceeded):
+        scheduler.acquire(10, deadline=time.monotonic() + 0.05)
+
+    scheduler.release(reserved)
+    assert scheduler.metrics()["queue_depth"] == 0
+
+
+class _StreamingStub(StubLLM):
+    def stream(self, prompt, **kwargs):
+        yield from ("a", "b")
+
+
+def test_stream_and_batch_are_admitted_by_the_scheduler():
+    llm = ScheduledLLM(_StreamingStub(latency=0.0), LLMScheduler(max_in_flight=2))
+
+    chunks = llm.stream("question")
+    assert next(chunks) == "a"
+    # The slot is held while the stream is being consumed
+    assert llm.scheduler.metrics()["in_flight"] == 1
+    assert list(chunks) == ["b"]
+    assert llm.scheduler.metrics()["in_flight"] == 0
+
+    replies = llm.batch(["one", "two", "three"], priority=Priority.BATCH)
+
+    assert [r.content for r in replies] == ["ok"] * 3
+    assert llm.scheduler.metrics()["priorities"]["batch"]["admitted"] == 3
+
+
+def test_unscheduled_client_methods_are_refused():
+    llm = ScheduledLLM(StubLLM(), LLMScheduler())
+
+    for name in ("ainvoke", "with_structured_output", "bind"):
+        with pytest.raises(AttributeError, match="admission control"):
+            getattr(llm, name)
+
+    assert llm.model_name == "stub"
@@ -0,0 +1,192 @@
+import threading
+
+from langchain_core.documents import Document
+
+from app.agent import agent_loop
+from app.agent import session as session_module
+from app.agent.evaluator import Evaluation
+from app.agent.planner import Plan
+from app.agent.session import Session, SessionStore
+from app.tools.registry import TOOL_REGISTRY
+
+
+def _fake_tool(calls):
+    def search(query, embedding=None):
+        calls.append((query, embedding is not None))
+        return [
+            Document(
+                page_content=f"{query} chunk {i}",
+                metadata={"url": f"https://x.example/{query}", "chunk_id": i,
+                          "source_name": "fake"},
+            )
+            for i in range(2)
+        ]
+    return search
+
+
+def test_follow_up_retrieves_only_incremental_evidence(monkeypatch):
+    calls, embedded = [], []
+    monkeypatch.setitem(
+        TOOL_REGISTRY, "fake_tool",
+        {"func": _fake_tool(calls), "description": "fake", "domains": []}
+    )
+    monkeypatch.setattr(
+        session_module, "_embed_queries",
+        lambda qs: embedded.append(list(qs)) or [[0.1, 0.2]] * len(qs)
+    )
+    session = Session("user-1")
+
+    docs, hits, stats = session.retrieve(["fake_tool"], ["rbac"])
+    assert stats["new_chunks"] == 2
+
+    docs, hits, stats = session.retrieve(["fake_tool"], ["rbac", "podsecurity"])
+
+    assert calls == [("rbac", True), ("podsecurity", True)]
+    # One embedding call per turn, for the queries not cached yet
+    assert embedded == [["rbac"], ["podsecurity"]]
+    assert stats["skipped"] == 1
+    assert stats["new_chunks"] == 2
+    assert stats["pool_size"] == 4
+    assert stats["tools_run"] == ["fake_tool"]
+    # Only this turn's tool results count as hits
+    assert {d.metadata["url"] for d in hits} == {"https://x.example/podsecurity"}
+    # New evidence comes first, pooled evidence follows
+    assert docs[0].metadata["url"].endswith("podsecurity")
+    assert len(docs) == 4
+
+
+def test_store_evicts_least_recently_used_sessions(monkeypatch):
+    monkeypatch.setattr(session_module, "_embed_queries", lambda qs: [[0.0] * 256] * len(qs))
+    store = SessionStore(max_bytes=3000)
+
+    for sid in ("a", "b", "c"):
+        store.get(sid).vector(f"question from {sid}")
+
+    store.get("a")  # most recently used
+    store.enforce_limit(keep="c")
+
+    assert len(store) == 2
+    assert store.evictions == 1
+    assert "b" not in store._sessions
+
+
+def _register(monkeypatch, calls):
+    monkeypatch.setitem(
+        TOOL_REGISTRY, "fake_tool",
+        {"func": _fake_tool(calls), "description": "fake", "domains": []}
+    )
+    monkeypatch.setattr(session_module, "_embed_queries", lambda qs: [[0.1, 0.2]] * len(qs))
+
+
+def test_evicted_chunks_are_fetched_again(monkeypatch):
+    calls = []
+    _register(monkeypatch, calls)
+    monkeypatch.setattr(session_module, "SESSION_MAX_POOL", 2)
+    session = Session("user-1")
+
+    session.retrieve(["fake_tool"], ["rbac"])
+    session.retrieve(["fake_tool"], ["podsecurity"])  # evicts both rbac chunks
+    docs, _, stats = session.retrieve(["fake_tool"], ["rbac"])
+
+    assert calls == [("rbac", True), ("podsecurity", True), ("rbac", True)]
+    assert stats["skipped"] == 0
+    assert stats["new_chunks"] == 2
+    assert ("fake_tool", "podsecurity") not in session.retrieved
+
+
+def test_follow_up_without_tools_reuses_previous_plan_tools():
+    session = Session("user-1")
+    first = Plan(intent="lookup", subquestions=[], tools=["search_kubernetes_docs"],
+                 need_clarification=False, clarification_question=None)
+    follow_up = first.model_copy(update={"tools": []})
+
+    assert session.tools(follow_up) == []
+
+    session.record_turn("What is RBAC?", first)
+    tools = session.tools(follow_up)
+    session.record_turn("And for Deployments?", follow_up, tools)
+
+    assert tools == ["search_kubernetes_docs"]
+    assert session.plan.tools == ["search_kubernetes_docs"]
+
+
+def test_turn_count_outlives_the_context_window():
+    session = Session("user-1")
+    plan = Plan(intent="lookup", subquestions=[], tools=[],
+                need_clarification=False, clarification_question=None)
+
+    for i in range(session_module.SESSION_CONTEXT_TURNS + 2):
+        session.record_turn(f"question {i}", plan)
+
+    assert len(session.turns) == session_module.SESSION_CONTEXT_TURNS
+    assert session.turn_count == session_module.SESSION_CONTEXT_TURNS + 2
+
+
+def test_concurrent_turns_and_accounting_do_not_race(monkeypatch):
+    calls = []
+    _register(monkeypatch, calls)
+    monkeypatch.setattr(session_module, "SESSION_MAX_POOL", 8)
+    session = Session("user-1")
+    errors = []
+
+    def turn(i):
+        try:
+            for j in range(20):
+                session.retrieve(["fake_tool"], [f"q{i}-{j}"])
+                session.size_bytes()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=turn, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(session.pool) == 8
+    assert len(session.retrieved) == len(set(session.retrieved))
+
+
+def test_follow_up_through_run_agent(monkeypatch):
+    calls, embedded = [], []
+    _register(monkeypatch, calls)
+    monkeypatch.setattr(
+        session_module, "_embed_queries",
+        lambda qs: embedded.append(list(qs)) or [[0.1, 0.2]] * len(qs)
+    )
+    plans = iter([
+        Plan(intent="lookup", subquestions=["rbac roles"], tools=["fake_tool"],
+             need_clarification=False, clarification_question=None),
+        Plan(intent="lookup", subquestions=["podsecurity admission"], tools=[],
+             need_clarification=False, clarification_question=None),
+    ])
+    contexts = []
+    monkeypatch.setattr(
+        agent_loop, "create_plan",
+        lambda question, context: contexts.append(context) or next(plans)
+    )
+    monkeypatch.setattr(agent_loop, "reason", lambda question, evidence, critique=None: "answer")
+    monkeypatch.setattr(agent_loop, "EVALUATION_MODE", "combined")
+    monkeypatch.setattr(agent_loop, "evaluate_answer", lambda q, a, e: Evaluation(
+        needs_revision=False, critic_rationale="ok", score=0.9, grounded=True,
+        relevant=True, well_cited=True, confidence="high", verdict="approve",
+        rationale="ok",
+    ))
+    session = Session("user-1")
+
+    _, first = agent_loop.run_agent("What is RBAC?", session=session)
+    _, follow_up = agent_loop.run_agent("And PodSecurity?", session=session)
+
+    # The first turn searches only the question, like a stateless request
+    assert calls[0] == ("What is RBAC?", True)
+    assert first["session"]["turn"] == 1 and first["session"]["queries"] == 1
+
+    # The follow-up sees the first turn, keeps its tools and searches
+    # its self-contained subquestion; both new queries embed in one call
+    assert "What is RBAC?" in contexts[1]
+    assert follow_up["session"]["turn"] == 2
+    assert follow_up["session"]["tools_from_previous_turn"] == ["fake_tool"]
+    assert calls[1:] == [("And PodSecurity?", True), ("podsecurity admission", True)]
+    assert embedded == [["What is RBAC?"], ["And PodSecurity?", "podsecurity admission"]]
+    assert follow_up["retrieval"]["tools"]["fake_tool"]["hits"] == 4
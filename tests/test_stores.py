@@ -0,0 +1,143 @@
+import gc
+import weakref
+
+import numpy as np
+import pytest
+from chromadb.api.shared_system_client import SharedSystemClient
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app import stores
+from app.chunk_store import ChunkStore
+from app.embeddings import build_index
+from app.stores import VersionedStore
+from app.tools import retrieval_tools
+
+
+def _build(collection, texts, embedding):
+    directory = stores.new_version_dir(collection)
+    store = stores.Chroma.from_documents(
+        [Document(page_content=t, metadata={"url": "u", "chunk_id": i})
+         for i, t in enumerate(texts)],
+        embedding=embedding,
+        persist_directory=str(directory),
+        collection_name=collection,
+    )
+    store._client.close()
+    return directory
+
+
+def _open_chroma_dirs():
+    return {
+        system.settings.persist_directory
+        for system in SharedSystemClient._identifier_to_system.values()
+    }
+
+
+def test_published_version_is_picked_up_without_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr(stores, "VECTORSTORE_DIR", str(tmp_path))
+    embedding = DeterministicFakeEmbedding(size=16)
+
+    blue = _build("k8s", ["rbac roles"], embedding)
+    stores.publish("k8s", blue)
+
+    handle = VersionedStore("k8s", embedding, check_interval=0)
+    assert handle.get()._collection.count() == 1
+
+    green = _build("k8s", ["rbac roles", "pod security", "network policy"], embedding)
+    # Unpublished builds are invisible to serving processes
+    assert handle.get()._collection.count() == 1
+
+    stores.publish("k8s", green)
+    assert handle.get()._collection.count() == 3
+    assert handle.directory == green
+
+
+def _build_quantized(collection, texts):
+    directory = stores.new_version_dir(collection)
+    ChunkStore.write(directory, [
+        Document(page_content=t, metadata={"url": "u", "chunk_id": i})
+        for i, t in enumerate(texts)
+    ])
+    vectors = np.random.default_rng(0).standard_normal((len(texts), 8))
+    build_index([str(i) for i in range(len(texts))], vectors, "int8", str(directory))
+    return directory
+
+
+def test_replaced_version_is_released(tmp_path, monkeypatch):
+    monkeypatch.setattr(stores, "VECTORSTORE_DIR", str(tmp_path))
+    handle = VersionedStore("k8s", embedding_function=None, check_interval=0)
+
+    stores.publish("k8s", _build_quantized("k8s", ["rbac roles"]))
+    old = handle.current()
+    assert old.store is None and len(old.index) == 1
+
+    # A request in flight still reads its hits after the publish
+    hit = old.chunks.ref(0)
+    index = weakref.ref(old.index)
+    chunks = weakref.ref(old.chunks)
+    text_file = old.chunks._file
+    del old
+
+    stores.publish("k8s", _build_quantized("k8s", ["rbac roles", "pod security"]))
+    assert len(handle.current().index) == 2
+    assert hit.page_content == "rbac roles"
+
+    del hit
+    gc.collect()
+    assert index() is None
+    assert chunks() is None
+    assert text_file.closed
+
+
+def test_replaced_chroma_version_is_closed(tmp_path, monkeypatch):
+    monkeypatch.setattr(stores, "VECTORSTORE_DIR", str(tmp_path))
+    embedding = DeterministicFakeEmbedding(size=16)
+    handle = VersionedStore("k8s", embedding, check_interval=0)
+
+    blue = _build("k8s", ["rbac roles"], embedding)
+    stores.publish("k8s", blue)
+    old = handle.current()
+    assert str(blue) in _open_chroma_dirs()
+
+    green = _build("k8s", ["rbac roles", "pod security"], embedding)
+    stores.publish("k8s", green)
+    assert handle.get()._collection.count() == 2
+
+    # A request in flight keeps the replaced client open
+    gc.collect()
+    assert old.store._collection.count() == 1
+
+    del old
+    gc.collect()
+    assert str(blue) not in _open_chroma_dirs()
+    assert str(green) in _open_chroma_dirs()
+
+
+@pytest.mark.parametrize("precision", ["float32", "float16"])
+def test_search_with_another_precision_fails_clearly(tmp_path, monkeypatch, precision):
+    monkeypatch.setattr(stores, "VECTORSTORE_DIR", str(tmp_path))
+    monkeypatch.setattr(retrieval_tools, "EMBEDDING_PRECISION", precision)
+    stores.publish("k8s", _build_quantized("k8s", ["rbac roles"]))  # int8
+    version = VersionedStore("k8s", embedding_function=None).current()
+
+    with pytest.raises(RuntimeError, match=f"no {precision} index"):
+        retrieval_tools._search(version, "rbac", 1, embedding=[0.0] * 8)
+
+
+def test_legacy_layout_and_pruning(tmp_path, monkeypatch):
+    monkeypatch.setattr(stores, "VECTORSTORE_DIR", str(tmp_path))
+
+    assert stores.current_dir("policy") == tmp_path / "policy"
+
+    versions = []
+    for i in range(4):
+        path = stores.collection_root("policy") / f"v2024010{i}"
+        path.mkdir(parents=True)
+        versions.append(path)
+    stores.publish("policy", versions[0])
+
+    removed = stores.prune("policy", keep=2)
+
+    assert sorted(removed) == ["v20240101"]
+    assert stores.current_dir("policy") == versions[0]
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+from app import warmup
+from benchmarks.stubs import StubLLM
+
+
+def _failing_touch(handle):
+    raise OSError("collection missing")
+
+
+def test_warm_up_connects_clients_and_sets_ready():
+    warmup.READY.clear()
+    fast, reasoning = StubLLM(), StubLLM()
+
+    report = warmup.warm_up(handles=(), clients=(fast, reasoning))
+
+    assert warmup.is_ready()
+    assert fast.connected and reasoning.connected
+    assert "tokenizer" in report["seconds"]
+    assert any(name.startswith("prompt:") for name in report["seconds"])
+    assert report["errors"] == {}
+
+
+def test_failed_step_is_reported_and_process_still_ready(monkeypatch):
+    from app.tools import retrieval_tools
+
+    monkeypatch.setattr(retrieval_tools, "touch", _failing_touch)
+    warmup.READY.clear()
+
+    report = warmup.warm_up(
+        handles=(SimpleNamespace(collection="missing"),),
+        clients=(object(),),
+    )
+
+    assert warmup.is_ready()
+    assert report["collections"] == {"missing": None}
+    assert "OSError" in report["errors"]["store:missing"]
+    assert "TypeError" in report["errors"]["connect:object"]
+
+
+def test_disabled_warm_up_is_ready_immediately():
+    warmup.READY.clear()
+
+    assert warmup.start(enabled=False) is None
+    assert warmup.wait_until_ready(timeout=0)
+
+
+def test_wait_returns_when_warm_up_was_never_started(monkeypatch):
+    warmup.READY.clear()
+    monkeypatch.setattr(warmup, "_thread", None)
+
+    # No timeout: this would block forever if it waited on the flag
+    assert warmup.wait_until_ready() is False